@@ -1,4 +1,5 @@
 import argparse
+import asyncio
 import os
 import socket
 import threading
@@ -6,6 +7,7 @@ import time
 from pathlib import Path
 import sys
 import traceback
+from concurrent.futures import ThreadPoolExecutor
 
 BASE_DIR = Path(__file__).resolve().parent.parent
 os.chdir(BASE_DIR)
@@ -13,15 +15,30 @@ sys.path.append(str(BASE_DIR))
 
 import webview
 
+from app.launcher_utils import signal_ready
 from app.ui.main import demo
 
 
 def _port_open(host: str, port: int) -> bool:
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.settimeout(0.05)
     try:
-        with socket.create_connection((host, port), timeout=1):
-            return True
+        return sock.connect_ex((host, port)) == 0
+    finally:
+        sock.close()
+
+
+def _port_bindable(host: str, port: int) -> bool:
+    # No SO_REUSEADDR: on macOS/BSD it lets this bind succeed next to a
+    # server listening on the wildcard address.
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    try:
+        sock.bind((host, port))
+        return True
     except OSError:
         return False
+    finally:
+        sock.close()
 
 
 LOADING_HTML_TEMPLATE = """
@@ -82,36 +99,51 @@ LOADING_HTML_TEMPLATE = """
     </div>
     <script>
       const target = "http://127.0.0.1:{port}";
+      let delay = 100;
       async function probe() {
         try {
-          const response = await fetch(target, { mode: "no-cors" });
-          if (response) {
-            window.location.replace(target);
-          }
+          // Any response means the server is up; HEAD skips the page body.
+          await fetch(target + "/config", { method: "HEAD", mode: "no-cors" });
+          window.location.replace(target);
+          return true;
         } catch (e) {
-          // keep waiting
+          return false;
         }
       }
-      setInterval(probe, 1500);
-      probe();
+      function loop() {
+        probe().then((ok) => {
+          if (!ok) {
+            setTimeout(loop, delay);
+            delay = Math.min(delay * 1.5, 1000);
+          }
+        });
+      }
+      loop();
     </script>
   </body>
   </html>
 """
+# The template is constant; split it once so rendering is a concatenation.
+_HTML_HEAD, _, _HTML_TAIL = LOADING_HTML_TEMPLATE.partition("{port}")
+
+
+def _port_free(port: int) -> bool:
+    # Nothing answering is not enough; make sure we can actually claim it.
+    return not _port_open("127.0.0.1", port) and _port_bindable("0.0.0.0", port)
 
 
 def _find_available_port(start: int, limit: int = 10) -> int:
-    for port in range(start, start + limit):
-        if not _port_open("127.0.0.1", port):
-            return port
-    return start
+    candidates = range(start, start + limit)
+    with ThreadPoolExecutor(max_workers=limit) as executor:
+        free = [port for port, ok in zip(candidates, executor.map(_port_free, candidates)) if ok]
+    return min(free) if free else start
 
 
 def _launch_gradio(port: int):
     print(f"Starting Gradio server on port {port}...", flush=True)
     
     # Import here to respect network configuration from main.py
-    from app.ui.main import demo, network_auth
+    from app.ui.main import demo, engine, network_auth
     
     # Get network configuration
     config = network_auth.get_config()
@@ -125,6 +157,12 @@ def _launch_gradio(port: int):
         inbrowser=False,
         prevent_thread_lock=True,
     )
+    # The listener is bound; wake the launcher that started us, if any
+    signal_ready()
+    
+    # Load the model once the window can connect; requests that arrive
+    # meanwhile wait on the same load
+    asyncio.run(engine.initialize())
 
 def _parse_args():
     parser = argparse.ArgumentParser(description="DexTalker Desktop Window")
@@ -158,7 +196,7 @@ def main():
             started_server = True
 
     print(f"Creating webview window for port {port}...", flush=True)
-    html = LOADING_HTML_TEMPLATE.replace("{port}", str(port))
+    html = f"{_HTML_HEAD}{port}{_HTML_TAIL}"
     webview.create_window("DexTalker", html=html, width=1200, height=800)
     print("Starting webview...", flush=True)
     webview.start(gui="cocoa", debug=True)
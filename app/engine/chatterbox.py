@@ -1,34 +1,144 @@
 import logging
 import asyncio
+import contextlib
+import contextvars
+import copy
+import functools
 import importlib
+import itertools
+import json
 import math
 import os
 import shutil
+import struct
+import tempfile
 import threading
+import time
 import uuid
-import wave
-from array import array
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 from typing import Optional, List, Tuple
 import re
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s | %(name)s | %(levelname)s | %(message)s',
-    handlers=[
-        logging.StreamHandler(),
-        logging.FileHandler("dextalker.log")
-    ]
-)
+import numpy as np
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 logger = logging.getLogger("DexTalker.Engine")
 
+
+def _env_int(name: str, default: int, minimum: int) -> int:
+    """
+    Read an integer tuning knob from the environment.
+    Malformed values fall back to default with a warning; the result is
+    clamped to at least minimum.
+    """
+    raw = os.environ.get(name)
+    if raw is None:
+        return default
+    try:
+        value = int(raw)
+    except ValueError:
+        logger.warning("Ignoring %s=%r (not an integer); using %d.", name, raw, default)
+        return default
+    if value < minimum:
+        logger.warning("%s=%d is below %d; using %d.", name, value, minimum, minimum)
+        return minimum
+    return value
+
+# Model loading is slow and holds the GIL for long stretches; keep it off
+# the event loop and off the default executor used for synthesis.
+_INIT_EXECUTOR = ThreadPoolExecutor(max_workers=1, thread_name_prefix="chatterbox-init")
+
+# Bulk file copies get their own small pool so they never take threads
+# away from synthesis.
+_IO_EXECUTOR = ThreadPoolExecutor(max_workers=2, thread_name_prefix="chatterbox-io")
+
+# Worker pool for synthesis, recording and add-voice offloads. Tune to the
+# number of concurrent TTS jobs the device can run plus expected file I/O.
+# Kept separate from the loop's default executor, which the host app owns.
+_THREAD_POOL_SIZE = _env_int("DEXTALKER_THREAD_POOL_SIZE", 16, minimum=1)
+_WORKER_EXECUTOR = ThreadPoolExecutor(max_workers=_THREAD_POOL_SIZE, thread_name_prefix="dextalker")
+
+# Characters not allowed in stored voice names.
+_SAFE_NAME_RE = re.compile(r"[^A-Za-z0-9_-]+")
+
+# Per-process sequence for output file names; the pid keeps names unique
+# across processes writing to the same data directory, and the random seed
+# keeps a restarted process that reuses a pid from colliding within a second.
+_file_seq = itertools.count(uuid.uuid4().int & 0xFFFF)
+
+
+def _file_stamp() -> str:
+    """Return a unique, sortable stamp for generated file names."""
+    return f"{time.strftime('%Y%m%d_%H%M%S')}_{os.getpid()}_{next(_file_seq):04x}"
+
+
+def _sendfile_copy(src, dst) -> None:
+    """
+    Copy src to dst in-kernel with os.sendfile, then copy metadata.
+    Falls back to shutil.copyfile where file-to-file sendfile is not
+    supported (e.g. macOS, which uses fcopyfile there instead).
+    """
+    try:
+        with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+            remaining = os.fstat(fsrc.fileno()).st_size
+            offset = 0
+            while remaining > 0:
+                sent = os.sendfile(fdst.fileno(), fsrc.fileno(), offset, remaining)
+                if sent == 0:
+                    break
+                offset += sent
+                remaining -= sent
+    except (AttributeError, OSError):
+        shutil.copyfile(src, dst)
+    shutil.copystat(src, dst)
+
+
+async def _to_thread(func, *args):
+    """
+    asyncio.to_thread, but on the engine's own pool sized by
+    DEXTALKER_THREAD_POOL_SIZE rather than the loop's default executor.
+    """
+    ctx = contextvars.copy_context()
+    return await asyncio.get_running_loop().run_in_executor(
+        _WORKER_EXECUTOR, functools.partial(ctx.run, func, *args)
+    )
+
+
+_LAZY = {}
+
+
+def _lazy(name: str):
+    """Import an optional dependency on first use and reuse the module afterwards."""
+    module = _LAZY.get(name)
+    if module is None:
+        module = _LAZY[name] = importlib.import_module(name)
+    return module
+
+
+@functools.lru_cache(maxsize=None)
+def _get_provider_cls(module_name: str, attr: str):
+    """Import module_name once per process and return its attr, or None if missing."""
+    try:
+        module = importlib.import_module(module_name)
+    except ImportError:
+        return None
+    return getattr(module, attr, None)
+
+
 class ChatterboxEngine:
     """
     Core Audio Engine for DexTalker using Chatterbox architecture.
     Prioritizes reliability, thread-safety, and deterministic outputs.
     """
+    # data_dirs whose directory layout has already been created in this process
+    _INITED_DIRS = set()
+
     def __init__(self, data_dir: str = "data"):
         self.data_dir = Path(data_dir)
         self.models_dir = self.data_dir / "models"
@@ -37,99 +147,273 @@ class ChatterboxEngine:
         self.recordings_dir = self.data_dir / "recordings"
         self.videos_dir = self.data_dir / "videos"  # For temp video processing
         self.voice_metadata_file = self.data_dir / "voice_metadata.json"
+        self.mps_flag_file = self.data_dir / ".mps_ok"
         
-        # Ensure directories exist
-        self.models_dir.mkdir(parents=True, exist_ok=True)
-        self.output_dir.mkdir(parents=True, exist_ok=True)
-        self.voices_dir.mkdir(parents=True, exist_ok=True)
-        self.recordings_dir.mkdir(parents=True, exist_ok=True)
-        self.videos_dir.mkdir(parents=True, exist_ok=True)
-        
-        # Create .gitkeep files for empty directories
-        for directory in [self.models_dir, self.output_dir]:
-            gitkeep = directory / ".gitkeep"
-            if not gitkeep.exists():
-                gitkeep.touch()
+        # Ensure directories exist (once per data_dir per process)
+        data_key = self.data_dir.resolve()
+        if data_key not in ChatterboxEngine._INITED_DIRS:
+            self.models_dir.mkdir(parents=True, exist_ok=True)
+            self.output_dir.mkdir(parents=True, exist_ok=True)
+            self.voices_dir.mkdir(parents=True, exist_ok=True)
+            self.recordings_dir.mkdir(parents=True, exist_ok=True)
+            self.videos_dir.mkdir(parents=True, exist_ok=True)
+            
+            # Create .gitkeep files for empty directories
+            for directory in [self.models_dir, self.output_dir]:
+                gitkeep = directory / ".gitkeep"
+                if not gitkeep.exists():
+                    gitkeep.touch()
+            ChatterboxEngine._INITED_DIRS.add(data_key)
         
         self.is_loaded = False
         self._provider = None
         self._provider_name = None
         self._provider_device = None
         self._provider_sample_rate = None
-        self._lock = threading.Lock()
-        self._init_lock = None
-        self._init_lock_loop = None
+        self._inference_sem = threading.BoundedSemaphore(1)
+        self._concurrency = 1
+        # (voices_dir mtime_ns, {lowercase stem: path}, sorted display names)
+        self._voice_cache = None
+        # ((mtime_ns, size) of voice_metadata.json, parsed metadata)
+        self._meta_cache = None
+        self._synth_sem = None
+        self._synth_sem_loop = None
+        # Opt-in micro-batching of concurrent synthesis requests.
+        self._batch_size = _env_int("DEXTALKER_BATCH_SIZE", 1, minimum=1)
+        self._batch_window = _env_int("DEXTALKER_BATCH_WINDOW_MS", 20, minimum=0) / 1000.0
+        self._batch_queue = None
+        self._batch_loop = None
+        self._batch_task = None
+        self._is_warmed = False
+        # Encoded voice prompts: {path: (mtime_ns, conds)}; see _voice_conditioning.
+        self._conds_cache = {}
+        self._default_conds = None
+        self._conds_key = (None, None)
+        self._conds_users = 0
+        self._conds_cv = threading.Condition()
+        # Guards _init_future, the load in progress; shared by every thread
+        # and event loop that calls initialize.
+        self._init_guard = threading.Lock()
+        self._init_future = None
         
     async def initialize(self) -> Tuple[bool, str]:
         """
         Initialize the TTS engine asynchronously.
+        Concurrent callers, including ones on other threads or event loops,
+        share a single load.
         Returns: (success, message)
         """
-        loop = asyncio.get_running_loop()
-        if self._init_lock is None or self._init_lock_loop is not loop:
-            self._init_lock = asyncio.Lock()
-            self._init_lock_loop = loop
-
-        async with self._init_lock:
+        with self._init_guard:
             if self.is_loaded:
                 return True, "Chatterbox Engine already initialized."
+            pending = self._init_future
+            owner = pending is None
+            if owner:
+                pending = self._init_future = Future()
+        if not owner:
+            return await asyncio.wrap_future(pending)
+
+        result = (False, "Chatterbox initialization was interrupted.")
+        try:
+            result = await self._load()
+            return result
+        finally:
+            with self._init_guard:
+                # Cleared on failure too, so a later call can retry
+                self._init_future = None
+            pending.set_result(result)
+
+    async def _load(self) -> Tuple[bool, str]:
+        """Load the provider (or select fallback mode); called by initialize only."""
+        loop = asyncio.get_running_loop()
+        logger.info("Initializing Chatterbox Engine...")
+        try:
+            # Import lazily to keep startup light.
+            self._provider = None
+            self._provider_name = None
+            self._provider_device = None
+            self._provider_sample_rate = None
 
-            logger.info("Initializing Chatterbox Engine...")
             try:
-                # Import lazily to keep startup light.
-                self._provider = None
-                self._provider_name = None
-                self._provider_device = None
-                self._provider_sample_rate = None
+                provider_cls = _get_provider_cls("chatterbox", "ChatterboxTTS")
+                if provider_cls is not None:
+                    torch = _lazy("torch")
+                    if torch.cuda.is_available():
+                        device = "cuda"
+                        # Let matmuls/convolutions use tensor cores and
+                        # autotune kernels for the fixed model shapes.
+                        torch.backends.cuda.matmul.allow_tf32 = True
+                        torch.backends.cudnn.allow_tf32 = True
+                        torch.backends.cudnn.benchmark = True
+                    elif torch.backends.mps.is_available() and self._mps_flag(torch) != "fail":
+                        device = "mps"
+                    else:
+                        device = "cpu"
+                    logger.info("Loading Chatterbox models on %s...", device)
+                    try:
+                        self._provider = await loop.run_in_executor(
+                            _INIT_EXECUTOR, functools.partial(provider_cls.from_pretrained, device=device)
+                        )
+                    except Exception as e:
+                        if device != "mps":
+                            raise
+                        # Remember the failure so later starts skip straight to CPU.
+                        logger.warning("MPS load failed, retrying on CPU. Error: %s", e)
+                        self._set_mps_flag(torch, "fail")
+                        device = "cpu"
+                        self._provider = await loop.run_in_executor(
+                            _INIT_EXECUTOR, functools.partial(provider_cls.from_pretrained, device=device)
+                        )
+                    else:
+                        if device == "mps":
+                            self._set_mps_flag(torch, "ok")
+                    self._provider_name = "chatterbox"
+                    self._provider_device = device
+                    if os.environ.get("DEXTALKER_TORCH_COMPILE") == "1":
+                        self._compile_provider()
+                    self._provider_sample_rate = getattr(self._provider, "sr", None)
+                    self._default_conds = getattr(self._provider, "conds", None)
+            except Exception as e:
+                logger.warning("Chatterbox init failed, falling back. Error: %s", e)
 
-                try:
-                    module = importlib.import_module("chatterbox")
-                    provider_cls = getattr(module, "ChatterboxTTS", None)
+            if self._provider is None:
+                for module_name in ("chatterbox_tts",):
+                    provider_cls = _get_provider_cls(module_name, "TTS")
                     if provider_cls is not None:
-                        import torch
-                        if torch.cuda.is_available():
-                            device = "cuda"
-                        elif torch.backends.mps.is_available():
-                            device = "mps"
-                        else:
-                            device = "cpu"
-                        logger.info("Loading Chatterbox models on %s...", device)
-                        self._provider = provider_cls.from_pretrained(device=device)
-                        self._provider_name = "chatterbox"
-                        self._provider_device = device
-                        self._provider_sample_rate = getattr(self._provider, "sr", None)
-                except ImportError:
-                    pass
-                except Exception as e:
-                    logger.warning("Chatterbox init failed, falling back. Error: %s", e)
-
-                if self._provider is None:
-                    for module_name in ("chatterbox_tts",):
-                        try:
-                            module = importlib.import_module(module_name)
-                        except ImportError:
-                            continue
-                        provider_cls = getattr(module, "TTS", None)
-                        if provider_cls is not None:
-                            self._provider = provider_cls()
-                            logger.info("Chatterbox provider loaded from %s.", module_name)
-                            self._provider_name = module_name
-                            break
-
-                if self._provider is None:
-                    logger.warning("Chatterbox library not found or failed to load. Running in fallback audio mode.")
-
-                # Simulating load time for realism/verification
-                await asyncio.sleep(0.5)
-
-                self.is_loaded = True
-                msg = "Chatterbox Engine initialized successfully."
-                logger.info(msg)
-                return True, msg
+                        self._provider = await loop.run_in_executor(_INIT_EXECUTOR, provider_cls)
+                        logger.info("Chatterbox provider loaded from %s.", module_name)
+                        self._provider_name = module_name
+                        break
+
+            if self._provider is None:
+                logger.warning("Chatterbox library not found or failed to load. Running in fallback audio mode.")
+            else:
+                # GPU backends schedule concurrent submissions themselves; on
+                # CPU the BLAS threads already saturate the cores.
+                default_concurrency = "4" if self._provider_device in ("cuda", "mps") else "1"
+                concurrency = int(os.environ.get("DEXTALKER_TTS_CONCURRENCY", default_concurrency))
+                self._concurrency = max(1, concurrency)
+                self._inference_sem = threading.BoundedSemaphore(self._concurrency)
+                await loop.run_in_executor(_INIT_EXECUTOR, self._warmup)
+
+            self.is_loaded = True
+            msg = "Chatterbox Engine initialized successfully."
+            logger.info(msg)
+            return True, msg
+        except Exception as e:
+            msg = f"Failed to initialize Chatterbox: {str(e)}"
+            logger.error(msg)
+            return False, msg
+
+    def _mps_flag(self, torch) -> Optional[str]:
+        """
+        Return the recorded MPS load outcome ("ok"/"fail") for this torch version,
+        or None if MPS has not been tried with it yet.
+        """
+        try:
+            recorded_version, outcome = self.mps_flag_file.read_text().split()
+        except (OSError, ValueError):
+            return None
+        return outcome if recorded_version == torch.__version__ else None
+
+    def _set_mps_flag(self, torch, outcome: str) -> None:
+        try:
+            self.mps_flag_file.write_text(f"{torch.__version__} {outcome}\n")
+        except OSError as e:
+            logger.warning("Failed to record MPS status: %s", e)
+
+    def _compile_provider(self) -> None:
+        """
+        Wrap the provider's nn.Module submodels with torch.compile.
+        Compilation itself is deferred to the first call, i.e. the warmup.
+        """
+        torch = _lazy("torch")
+        backend = os.environ.get("DEXTALKER_COMPILE_BACKEND", "inductor")
+        options = {"mode": "reduce-overhead"} if backend == "inductor" else {}
+        for attr in ("t3", "s3gen", "model"):
+            module = getattr(self._provider, attr, None)
+            if not isinstance(module, torch.nn.Module):
+                continue
+            try:
+                setattr(self._provider, attr, torch.compile(module, backend=backend, **options))
+                logger.info("Compiled provider.%s with backend %s.", attr, backend)
             except Exception as e:
-                msg = f"Failed to initialize Chatterbox: {str(e)}"
-                logger.error(msg)
-                return False, msg
+                logger.warning("torch.compile failed for provider.%s, using eager. Error: %s", attr, e)
+
+    def _warmup(self) -> None:
+        """
+        Run one throwaway generation so kernel autotuning and allocator growth
+        happen during initialize rather than on the first user request.
+        """
+        if self._is_warmed:
+            return
+        generate = getattr(self._provider, "generate", None)
+        if not callable(generate):
+            return
+        try:
+            torch = _lazy("torch")
+            with torch.inference_mode():
+                generate("warmup.", audio_prompt_path=None)
+            if self._provider_device == "cuda":
+                torch.cuda.synchronize()
+            self._is_warmed = True
+            logger.info("Provider warmup complete.")
+        except Exception as e:
+            logger.warning("Provider warmup failed, continuing. Error: %s", e)
+
+    def _synthesis_semaphore(self) -> asyncio.Semaphore:
+        """Return the loop-side synthesis limiter, creating it for the running loop."""
+        loop = asyncio.get_running_loop()
+        if self._synth_sem is None or self._synth_sem_loop is not loop:
+            self._synth_sem = asyncio.Semaphore(self._concurrency)
+            self._synth_sem_loop = loop
+        return self._synth_sem
+
+    def _batch_queue_for_loop(self) -> asyncio.Queue:
+        """Return the micro-batching queue for the running loop, starting its worker on first use."""
+        loop = asyncio.get_running_loop()
+        if self._batch_queue is None or self._batch_loop is not loop:
+            self._batch_queue = asyncio.Queue()
+            self._batch_loop = loop
+            self._batch_task = loop.create_task(self._batch_worker(self._batch_queue))
+        return self._batch_queue
+
+    async def _batch_worker(self, queue: asyncio.Queue):
+        """
+        Collect requests that arrive within the batch window, group them by voice
+        and run each group as one generate call.
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await queue.get()]
+            deadline = loop.time() + self._batch_window
+            while len(batch) < self._batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            groups = {}
+            for item in batch:
+                groups.setdefault(item[1], []).append(item)
+            await asyncio.gather(*(self._run_batch(voice_id, items) for voice_id, items in groups.items()))
+
+    async def _run_batch(self, voice_id: str, items: list):
+        jobs = [(text, output_path) for text, _, output_path, _ in items]
+        try:
+            async with self._synthesis_semaphore():
+                await _to_thread(self._generate_batch, voice_id, jobs)
+        except Exception as e:
+            for *_, future in items:
+                if not future.done():
+                    future.set_exception(e)
+        else:
+            for *_, future in items:
+                if not future.done():
+                    future.set_result(None)
 
     async def synthesize(self, text: str, voice_id: str = "default") -> Tuple[Optional[str], str]:
         """
@@ -146,24 +430,37 @@ class ChatterboxEngine:
             return None, "Error: Input text cannot be empty."
 
         if not self.is_loaded:
+            logger.warning("Engine not preloaded; loading the model on the first synthesis request.")
             success, msg = await self.initialize()
             if not success:
                 return None, msg
 
         # Generate deterministic filename
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        unique_id = uuid.uuid4().hex[:8]
-        filename = f"tts_{timestamp}_{unique_id}.wav"
+        filename = f"tts_{_file_stamp()}.wav"
         output_path = self.output_dir / filename
         
-        logger.info(f"Starting synthesis: inputs='{text[:30]}...' voice='{voice_id}' -> target='{output_path}'")
+        logger.debug("Starting synthesis: inputs=%r voice=%s -> target=%s", text[:30], voice_id, output_path)
         
         try:
-            # Thread-safe execution wrapper
-            await asyncio.to_thread(self._generate_file, text, voice_id, output_path)
+            if self._provider is not None and self._batch_size > 1:
+                future = asyncio.get_running_loop().create_future()
+                self._batch_queue_for_loop().put_nowait((text, voice_id, output_path, future))
+                await future
+            elif self._provider is not None:
+                # Queue excess requests on the loop instead of parking
+                # worker threads on the inference semaphore.
+                async with self._synthesis_semaphore():
+                    await _to_thread(self._generate_file, text, voice_id, output_path)
+            else:
+                await _to_thread(self._generate_file, text, voice_id, output_path)
             
-            if output_path.exists() and output_path.stat().st_size > 0:
-                logger.info(f"Synthesis complete: {output_path}")
+            try:
+                ok = os.stat(output_path).st_size > 0
+            except FileNotFoundError:
+                ok = False
+
+            if ok:
+                logger.debug("Synthesis complete: %s", output_path)
                 return str(output_path), "Success"
             else:
                 msg = "Error: File was not created or is empty."
@@ -181,7 +478,7 @@ class ChatterboxEngine:
         This runs inside a thread pool.
         """
         if self._provider is not None:
-            with self._lock:
+            with self._inference_sem:
                 tts_to_file = getattr(self._provider, "tts_to_file", None)
                 if callable(tts_to_file):
                     try:
@@ -199,12 +496,33 @@ class ChatterboxEngine:
 
         self._generate_fallback_audio(text, output_path)
 
+    def _generate_batch(self, voice_id: str, jobs: List[Tuple[str, Path]]):
+        """
+        Blocking batch counterpart of _generate_file; runs inside the thread pool.
+        Falls back to one _generate_file call per job if the provider rejects the batch.
+        """
+        batchable = (
+            len(jobs) > 1
+            and not callable(getattr(self._provider, "tts_to_file", None))
+            and callable(getattr(self._provider, "generate", None))
+        )
+        if batchable:
+            try:
+                with self._inference_sem:
+                    self._generate_chatterbox_batch(voice_id, jobs)
+                return
+            except Exception as e:
+                logger.warning("Batched generate failed, running %d requests one by one. Error: %s", len(jobs), e)
+
+        for text, output_path in jobs:
+            self._generate_file(text, voice_id, output_path)
+
     def _generate_chatterbox_audio(self, text: str, voice_id: str, output_path: Path):
         voice_path = self._resolve_voice_path(voice_id)
-        audio_prompt = str(voice_path) if voice_path else None
-        
+
         try:
-            audio = self._provider.generate(text, audio_prompt_path=audio_prompt)
+            with self._voice_conditioning(voice_path) as audio_prompt, self._inference_context():
+                audio = self._provider.generate(text, audio_prompt_path=audio_prompt)
         except Exception as e:
             raise RuntimeError(f"Failed to generate audio: {str(e)}") from e
 
@@ -214,18 +532,101 @@ class ChatterboxEngine:
             # Audio might already be in correct shape
             pass
 
+        self._write_provider_audio(audio, output_path)
+
+    def _generate_chatterbox_batch(self, voice_id: str, jobs: List[Tuple[str, Path]]):
+        """Generate several texts for the same voice with one provider.generate call."""
+        voice_path = self._resolve_voice_path(voice_id)
+
+        with self._voice_conditioning(voice_path) as audio_prompt, self._inference_context():
+            batch = self._provider.generate([text for text, _ in jobs], audio_prompt_path=audio_prompt)
+        if len(batch) != len(jobs):
+            raise RuntimeError(f"Provider returned {len(batch)} clips for {len(jobs)} texts")
+
+        for audio, (_, output_path) in zip(batch, jobs):
+            self._write_provider_audio(audio, output_path)
+
+    @contextlib.contextmanager
+    def _voice_conditioning(self, voice_path: Optional[Path]):
+        """
+        Yield the audio_prompt_path to pass to provider.generate.
+        
+        Providers exposing prepare_conditionals/conds get the encoded reference
+        audio cached per (path, mtime) and installed as provider.conds, so the
+        prompt is not decoded and re-encoded on every request. Because conds is
+        shared provider state, generations for different voices never overlap.
+        """
+        provider = self._provider
+        if not callable(getattr(provider, "prepare_conditionals", None)) or not hasattr(provider, "conds"):
+            yield str(voice_path) if voice_path else None
+            return
+
+        key = str(voice_path) if voice_path else None
+        mtime_ns = os.stat(key).st_mtime_ns if key else None
+        with self._conds_cv:
+            while self._conds_users and self._conds_key != (key, mtime_ns):
+                self._conds_cv.wait()
+            if self._conds_key != (key, mtime_ns):
+                if key is None:
+                    provider.conds = self._default_conds
+                else:
+                    cached = self._conds_cache.get(key)
+                    if cached is not None and cached[0] == mtime_ns:
+                        provider.conds = cached[1]
+                    else:
+                        provider.prepare_conditionals(key)
+                        self._conds_cache[key] = (mtime_ns, provider.conds)
+                self._conds_key = (key, mtime_ns)
+            self._conds_users += 1
+        try:
+            yield None
+        finally:
+            with self._conds_cv:
+                self._conds_users -= 1
+                if not self._conds_users:
+                    self._conds_cv.notify_all()
+
+    def _inference_context(self) -> contextlib.ExitStack:
+        """
+        Context for provider.generate: torch.inference_mode (no autograd
+        bookkeeping), plus float16 autocast on GPU backends.
+        """
+        stack = contextlib.ExitStack()
+        try:
+            torch = _lazy("torch")
+        except ImportError:
+            return stack
+        stack.enter_context(torch.inference_mode())
+        if self._provider_device in ("cuda", "mps"):
+            stack.enter_context(torch.autocast(device_type=self._provider_device, dtype=torch.float16))
+        return stack
+
+    def _write_provider_audio(self, audio, output_path: Path):
+        """Write a single provider clip (tensor or array) to output_path as 16-bit PCM."""
         if hasattr(audio, "detach"):
-            audio = audio.detach().cpu().numpy()
+            audio = audio.detach()
+            if audio.is_floating_point():
+                torch = _lazy("torch")
+                # Quantize on the device so only int16 PCM crosses to the host.
+                # Round, don't truncate, to match libsndfile's float conversion.
+                audio = (audio.clamp(-1.0, 1.0) * 32767.0).round().to(torch.int16)
+            audio = audio.cpu().numpy()
+        elif isinstance(audio, np.ndarray) and audio.dtype.kind == "f":
+            # Same quantization for providers that hand back numpy floats.
+            audio = np.clip(audio, -1.0, 1.0)
+            audio *= 32767.0
+            np.rint(audio, out=audio)
+            audio = audio.astype(np.int16)
 
         try:
-            import soundfile as sf
+            sf = _lazy("soundfile")
         except ImportError as e:
             raise RuntimeError("soundfile is required for Chatterbox output.") from e
 
         sample_rate = self._provider_sample_rate or getattr(self._provider, "sr", None) or 24000
         
         try:
-            sf.write(str(output_path), audio, sample_rate)
+            sf.write(str(output_path), audio, sample_rate, subtype="PCM_16")
         except Exception as e:
             raise RuntimeError(f"Failed to write audio file: {str(e)}") from e
 
@@ -246,22 +647,37 @@ class ChatterboxEngine:
         if candidate.is_file():
             return candidate
 
-        direct = self.voices_dir / normalized
-        if direct.is_file():
-            return direct
+        key = normalized.lower()
+        if key.endswith(".wav"):
+            key = key[:-4]
+        return self._voice_index()[0].get(key)
 
-        if not normalized.lower().endswith(".wav"):
-            wav_candidate = self.voices_dir / f"{normalized}.wav"
-            if wav_candidate.is_file():
-                return wav_candidate
+    def _voice_index(self) -> Tuple[dict, Tuple[str, ...]]:
+        """
+        Return ({lowercase stem: path}, sorted voice names) for voices_dir.
+        Rebuilt only when the directory mtime changes, i.e. a voice was added or removed.
+        """
+        try:
+            mtime_ns = self.voices_dir.stat().st_mtime_ns
+        except OSError as e:
+            logger.warning("Failed to read voices directory. Error: %s", e)
+            return {}, ()
 
-        normalized_lower = normalized.lower()
-        for path in self.voices_dir.iterdir():
-            if path.is_file() and path.suffix.lower() == ".wav":
-                if path.stem.lower() == normalized_lower:
-                    return path
+        cache = self._voice_cache
+        if cache is not None and cache[0] == mtime_ns:
+            return cache[1], cache[2]
 
-        return None
+        with os.scandir(self.voices_dir) as it:
+            entries = sorted(
+                (entry.name, entry.path) for entry in it
+                if entry.name.lower().endswith(".wav") and entry.is_file()
+            )
+        index = {}
+        for name, path in entries:
+            index.setdefault(name[:-4].lower(), Path(path))
+        names = tuple(name[:-4] for name, _ in entries)
+        self._voice_cache = (mtime_ns, index, names)
+        return index, names
 
     def _generate_fallback_audio(self, text: str, output_path: Path):
         """Generate a short, valid WAV tone when no TTS provider is available."""
@@ -271,30 +687,28 @@ class ChatterboxEngine:
         amplitude = 0.2
         frames = int(sample_rate * duration)
 
-        try:
-            import numpy as np
-        except ImportError:
-            np = None
+        # Single float32 buffer, transformed in place: phase -> sin -> scaled -> rounded.
+        phase = np.arange(frames, dtype=np.float32)
+        phase *= 2 * math.pi * frequency / sample_rate
+        np.sin(phase, out=phase)
+        phase *= amplitude * 32767.0
+        np.rint(phase, out=phase)
+        pcm = memoryview(phase.astype("<i2")).cast("B")
 
+        # Fixed format (PCM_16 mono) and known length: write the 44-byte
+        # RIFF header ourselves, then the payload; f.write handles short writes.
+        header = struct.pack(
+            "<4sI4s4sIHHIIHH4sI",
+            b"RIFF", 36 + pcm.nbytes, b"WAVE",
+            b"fmt ", 16, 1, 1, sample_rate, sample_rate * 2, 2, 16,
+            b"data", pcm.nbytes,
+        )
         try:
-            with wave.open(str(output_path), "wb") as wf:
-                wf.setnchannels(1)
-                wf.setsampwidth(2)
-                wf.setframerate(sample_rate)
-
-                if np is not None:
-                    t = np.linspace(0, duration, frames, endpoint=False)
-                    waveform = amplitude * np.sin(2 * math.pi * frequency * t)
-                    audio = (waveform * 32767).astype(np.int16)
-                    wf.writeframes(audio.tobytes())
-                else:
-                    data = array("h")
-                    for i in range(frames):
-                        sample = int(32767 * amplitude * math.sin(2 * math.pi * frequency * i / sample_rate))
-                        data.append(sample)
-                    wf.writeframes(data.tobytes())
+            with open(output_path, "wb") as f:
+                f.write(header)
+                f.write(pcm)
         except Exception as e:
-            logger.error(f"Failed to generate fallback audio: {e}")
+            logger.error("Failed to generate fallback audio: %s", e)
             raise
 
     async def save_recording(self, source_path: str, name_prefix: str = "recording") -> Tuple[Optional[str], str]:
@@ -311,22 +725,18 @@ class ChatterboxEngine:
         if not source_path or not os.path.exists(source_path):
             return None, "Error: Source recording not found."
             
-        # Ensure recordings dir exists
-        recordings_dir = self.data_dir / "recordings"
-        recordings_dir.mkdir(parents=True, exist_ok=True)
-        
         # Generate clean filename
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         safe_prefix = "".join(c for c in name_prefix if c.isalnum() or c in ('-', '_'))
-        filename = f"{safe_prefix}_{timestamp}.wav"
-        dest_path = recordings_dir / filename
+        filename = f"{safe_prefix}_{_file_stamp()}.wav"
+        dest_path = self.recordings_dir / filename
         
         try:
-            # Use run_in_executor for file IO to avoid blocking
-            loop = asyncio.get_running_loop()
-            await loop.run_in_executor(None, shutil.copy2, source_path, dest_path)
+            # Run file IO on the dedicated I/O executor to avoid blocking
+            await asyncio.get_running_loop().run_in_executor(
+                _IO_EXECUTOR, _sendfile_copy, source_path, dest_path
+            )
             
-            logger.info(f"Saved recording: {source_path} -> {dest_path}")
+            logger.info("Saved recording: %s -> %s", source_path, dest_path)
             return str(dest_path), "Success"
         except Exception as e:
             msg = f"Failed to save recording: {e}"
@@ -338,36 +748,33 @@ class ChatterboxEngine:
         Get list of saved recordings.
         Returns: List of (Filename, Full Path) tuples, sorted by newest first.
         """
-        recordings_dir = self.data_dir / "recordings"
-        if not recordings_dir.exists():
-            return []
-            
-        files = []
         try:
-            for path in recordings_dir.iterdir():
-                if path.is_file() and path.suffix.lower() in ('.wav', '.mp3', '.ogg', '.flac'):
-                    files.append((path.name, str(path)))
+            with os.scandir(self.recordings_dir) as it:
+                entries = [
+                    (entry.name, entry.path, entry.stat().st_mtime)
+                    for entry in it
+                    if entry.name.lower().endswith(('.wav', '.mp3', '.ogg', '.flac')) and entry.is_file()
+                ]
+        except FileNotFoundError:
+            return []
         except OSError as e:
-            logger.error(f"Error listing recordings: {e}")
+            logger.error("Error listing recordings: %s", e)
             return []
             
         # Sort by modification time (newest first)
-        files.sort(key=lambda x: os.path.getmtime(x[1]), reverse=True)
-        return files
+        entries.sort(key=lambda x: x[2], reverse=True)
+        return [(name, path) for name, path, _ in entries]
 
     def get_output_directory(self) -> str:
         return str(self.output_dir)
 
     def get_available_voices(self) -> List[str]:
         """Return list of available voice profiles."""
-        voices = ["default"]
         try:
-            for path in sorted(self.voices_dir.iterdir()):
-                if path.is_file() and path.suffix.lower() == ".wav":
-                    voices.append(path.stem)
+            return ["default", *self._voice_index()[1]]
         except OSError as e:
             logger.warning("Failed to read voices directory. Error: %s", e)
-        return voices
+            return ["default"]
     
     def get_engine_status(self) -> dict:
         """Return engine status information for debugging and UI display."""
@@ -380,7 +787,7 @@ class ChatterboxEngine:
         }
 
     async def add_voice(self, voice_name: str, voice_file: str) -> Tuple[bool, str]:
-        return await asyncio.to_thread(self._add_voice_sync, voice_name, voice_file)
+        return await _to_thread(self._add_voice_sync, voice_name, voice_file)
 
     def _add_voice_sync(self, voice_name: str, voice_file: str) -> Tuple[bool, str]:
         if not voice_name or not voice_name.strip():
@@ -395,27 +802,30 @@ class ChatterboxEngine:
         if not src_path.is_file():
             return False, "Path must be a file."
 
-        safe_name = re.sub(r"[^A-Za-z0-9_-]+", "_", voice_name.strip()).strip("_")
+        safe_name = _SAFE_NAME_RE.sub("_", voice_name.strip()).strip("_")
         if not safe_name:
             return False, "Voice name must contain letters or numbers."
         
         # Check for duplicate
         dest_path = self.voices_dir / f"{safe_name}.wav"
         if dest_path.exists():
-            logger.warning(f"Voice '{safe_name}' already exists, overwriting.")
+            logger.warning("Voice '%s' already exists, overwriting.", safe_name)
 
-        try:
-            import soundfile as sf
-            audio, sr = sf.read(src_path)
-            sf.write(dest_path, audio, sr)
-        except Exception as audio_err:
-            if src_path.suffix.lower() != ".wav":
-                return False, "Unsupported audio format. Upload a .wav file."
+        if src_path.suffix.lower() == ".wav":
+            # Already the stored format; copy the bytes instead of decoding.
             try:
-                shutil.copy2(src_path, dest_path)
+                _sendfile_copy(src_path, dest_path)
             except Exception as e:
-                logger.error(f"Failed to save voice: {e}")
+                logger.error("Failed to save voice: %s", e)
                 return False, f"Failed to save voice: {e}"
+            return True, f"Voice '{safe_name}' added."
+
+        try:
+            sf = _lazy("soundfile")
+            audio, sr = sf.read(src_path)
+            sf.write(dest_path, audio, sr)
+        except Exception:
+            return False, "Unsupported audio format. Upload a .wav file."
 
         return True, f"Voice '{safe_name}' added."
 
@@ -424,7 +834,7 @@ class ChatterboxEngine:
         duration_sec: float = 5.0,
         sample_rate: int = 44100,
     ) -> Tuple[Optional[str], str]:
-        return await asyncio.to_thread(self._record_voice_sample_sync, duration_sec, sample_rate)
+        return await _to_thread(self._record_voice_sample_sync, duration_sec, sample_rate)
 
     def _record_voice_sample_sync(
         self,
@@ -432,29 +842,50 @@ class ChatterboxEngine:
         sample_rate: int,
     ) -> Tuple[Optional[str], str]:
         try:
-            import sounddevice as sd
+            sd = _lazy("sounddevice")
         except Exception:
             return None, "Recording is unavailable (sounddevice not installed)."
+        try:
+            sf = _lazy("soundfile")
+        except Exception:
+            return None, "Recording is unavailable (soundfile not installed)."
 
         duration_sec = max(1.0, min(30.0, float(duration_sec)))
         frames = int(sample_rate * duration_sec)
 
-        try:
-            audio = sd.rec(frames, samplerate=sample_rate, channels=1, dtype="int16")
-            sd.wait()
-        except Exception as e:
-            return None, f"Recording failed: {e}"
-
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        unique_id = uuid.uuid4().hex[:6]
-        filename = f"voice_rec_{timestamp}_{unique_id}.wav"
+        filename = f"voice_rec_{_file_stamp()}.wav"
         output_path = self.recordings_dir / filename
 
+        # Stream blocks straight to disk so memory stays at one block
+        # regardless of duration.
+        remaining = frames
+        done = threading.Event()
+
         try:
-            import soundfile as sf
-            sf.write(output_path, audio, sample_rate)
+            with sf.SoundFile(
+                output_path, mode="w", samplerate=sample_rate, channels=1, subtype="PCM_16"
+            ) as sf_file:
+                def callback(indata, block_frames, time_info, status):
+                    nonlocal remaining
+                    take = min(block_frames, remaining)
+                    sf_file.write(indata[:take])
+                    remaining -= take
+                    if remaining <= 0:
+                        done.set()
+                        raise sd.CallbackStop
+
+                with sd.InputStream(
+                    samplerate=sample_rate, channels=1, dtype="int16", callback=callback
+                ):
+                    completed = done.wait(duration_sec + 5.0)
         except Exception as e:
-            return None, f"Failed to save recording: {e}"
+            output_path.unlink(missing_ok=True)
+            return None, f"Recording failed: {e}"
+
+        if not completed:
+            # The input stream stalled; don't hand back a truncated sample
+            output_path.unlink(missing_ok=True)
+            return None, "Recording failed: the microphone stopped delivering audio."
 
         return str(output_path), "Recording captured."
 
@@ -486,13 +917,12 @@ class ChatterboxEngine:
         
         try:
             from app.video.processor import VideoProcessor
-            import json
             
             # Load config if exists
             config = {}
             if Path("config.toml").exists():
                 try:
-                    import toml
+                    toml = _lazy("toml")
                     full_config = toml.load("config.toml")
                     config = full_config.get("video_voice_clone", {})
                 except:
@@ -508,17 +938,17 @@ class ChatterboxEngine:
                 return False, f"Video validation failed: {msg}"
             
             # Sanitize voice name
-            safe_name = re.sub(r"[^A-Za-z0-9_-]+", "_", voice_name.strip()).strip("_")
+            safe_name = _SAFE_NAME_RE.sub("_", voice_name.strip()).strip("_")
             if not safe_name:
                 return False, "Voice name must contain letters or numbers."
             
             # Check for duplicate
             dest_audio_path = self.voices_dir / f"{safe_name}.wav"
             if dest_audio_path.exists():
-                logger.warning(f"Voice '{safe_name}' already exists, overwriting.")
+                logger.warning("Voice '%s' already exists, overwriting.", safe_name)
             
             # Extract audio segment
-            temp_audio_path = self.videos_dir / f"temp_{safe_name}_{uuid.uuid4().hex[:6]}.wav"
+            temp_audio_path = self.videos_dir / f"temp_{safe_name}_{_file_stamp()}.wav"
             
             try:
                 success, extract_msg = processor.extract_audio_segment(
@@ -548,40 +978,71 @@ class ChatterboxEngine:
                 }
                 self._save_voice_metadata(metadata)
                 
-                logger.info(f"Created voice from video: {safe_name}")
+                logger.info("Created voice from video: %s", safe_name)
                 return True, f"Voice profile '{safe_name}' created successfully from video!"
                 
             finally:
                 # Cleanup temp file if it still exists
-                if temp_audio_path.exists():
-                    processor.cleanup_temp_files(temp_audio_path)
+                processor.cleanup_temp_files(temp_audio_path)
                     
         except ImportError as e:
-            logger.error(f"Missing dependency: {e}")
-            return False, "ffmpeg-python or librosa not installed. Please install dependencies."
+            logger.error("Missing dependency: %s", e)
+            return False, "ffmpeg-python or soundfile not installed. Please install dependencies."
         except Exception as e:
-            logger.error(f"Failed to create voice from video: {e}")
+            logger.error("Failed to create voice from video: %s", e)
             return False, f"Failed to create voice: {str(e)}"
     
     def _load_voice_metadata(self) -> dict:
-        """Load voice metadata from JSON file."""
-        if self.voice_metadata_file.exists():
-            try:
-                import json
-                with open(self.voice_metadata_file, 'r') as f:
-                    return json.load(f)
-            except Exception as e:
-                logger.warning(f"Failed to load voice metadata: {e}")
-        return {}
+        """Load voice metadata from JSON file, re-reading it only when it changes on disk."""
+        try:
+            st = os.stat(self.voice_metadata_file)
+        except FileNotFoundError:
+            return {}
+        except OSError as e:
+            logger.warning("Failed to load voice metadata: %s", e)
+            return {}
+
+        key = (st.st_mtime_ns, st.st_size)
+        cache = self._meta_cache
+        # Deep copies: entries are dicts, and callers must not edit the cache
+        if cache is not None and cache[0] == key:
+            return copy.deepcopy(cache[1])
+
+        try:
+            with open(self.voice_metadata_file, 'rb') as f:
+                data = f.read()
+            metadata = orjson.loads(data) if orjson is not None else json.loads(data)
+        except Exception as e:
+            logger.warning("Failed to load voice metadata: %s", e)
+            return {}
+        self._meta_cache = (key, metadata)
+        return copy.deepcopy(metadata)
     
     def _save_voice_metadata(self, metadata: dict):
-        """Save voice metadata to JSON file."""
+        """Save voice metadata to JSON file atomically and refresh the cache."""
+        tmp_path = None
         try:
-            import json
-            with open(self.voice_metadata_file, 'w') as f:
-                json.dump(metadata, f, indent=2)
+            if orjson is not None:
+                data = orjson.dumps(metadata, option=orjson.OPT_INDENT_2)
+            else:
+                data = json.dumps(metadata, indent=2).encode("utf-8")
+            # A unique temp file per write, so concurrent saves never share one
+            fd, tmp_name = tempfile.mkstemp(
+                dir=self.voice_metadata_file.parent, prefix=f"{self.voice_metadata_file.name}.", suffix=".tmp"
+            )
+            tmp_path = Path(tmp_name)
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            # mkstemp creates 0600; keep the permissions a plain open() gave
+            os.chmod(tmp_path, 0o644)
+            # Readers see either the old or the new file, never a partial one.
+            os.replace(tmp_path, self.voice_metadata_file)
+            st = os.stat(self.voice_metadata_file)
+            self._meta_cache = ((st.st_mtime_ns, st.st_size), copy.deepcopy(metadata))
         except Exception as e:
-            logger.error(f"Failed to save voice metadata: {e}")
+            if tmp_path is not None:
+                tmp_path.unlink(missing_ok=True)
+            logger.error("Failed to save voice metadata: %s", e)
     
     def get_voice_metadata_info(self, voice_name: str) -> Optional[dict]:
         """Get metadata for a specific voice."""
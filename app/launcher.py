@@ -3,13 +3,19 @@ import tkinter as tk
 from tkinter import ttk
 import subprocess
 import os
-import socket
+from contextlib import suppress
 import signal
-import time
 import threading
+import time
 from pathlib import Path
 import sys
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.launcher_utils import (
+    create_ready_pipe, get_configured_port, kill_port_owners, poll_ready, port_open, spawn
+)
+
 class DexTalkerLauncher:
     def __init__(self, root):
         self.root = root
@@ -24,6 +30,7 @@ class DexTalkerLauncher:
         self.run_script = self.base_dir / "run.py"
         self.log_path = self.base_dir / "launcher.log"
         self.log_handle = None
+        self.port = get_configured_port(self.base_dir)
         
         # UI Styling
         style = ttk.Style()
@@ -77,27 +84,41 @@ class DexTalkerLauncher:
         self.is_running = False
         self.desktop_process = None
         self.desktop_log_handle = None
+        self._ready_pipe = None
+        self._ready_deadline = 0.0
+        self._cleanup_thread = None
         
-        # Start automatically on launch
-        self.launch_thread = threading.Thread(target=self.start_engine, daemon=True)
-        self.launch_thread.start()
+        # Start automatically on launch; only port cleanup leaves the Tk thread
+        self.root.after(0, self.start_engine)
         
         # Handling window closure
         self.root.protocol("WM_DELETE_WINDOW", self.shutdown_and_quit)
 
     def _set_status(self, text, color=None):
-        def update():
-            if color:
-                self.status_label.config(text=text, foreground=color)
-            else:
-                self.status_label.config(text=text)
-        self.root.after(0, update)
+        if color:
+            self.status_label.config(text=text, foreground=color)
+        else:
+            self.status_label.config(text=text)
 
     def start_engine(self):
+        # Settings may have changed since the launcher opened
+        self.port = get_configured_port(self.base_dir)
+        self.is_running = True
+        self._set_status("Status: Freeing port...")
+        # Finding and stopping port owners can block for seconds (lsof,
+        # SIGTERM grace); keep it off the Tk thread and poll for completion.
+        self._cleanup_thread = threading.Thread(target=self.clean_ports, daemon=True)
+        self._cleanup_thread.start()
+        self.root.after(50, self._wait_for_cleanup)
+
+    def _wait_for_cleanup(self):
+        if self._cleanup_thread.is_alive():
+            self.root.after(50, self._wait_for_cleanup)
+            return
+        self._spawn_engine()
+
+    def _spawn_engine(self):
         try:
-            self.clean_ports()
-            self.is_running = True
-            
             # Start the python run.py script
             # Use the same python interpreter running this launcher
             python_exe = sys.executable
@@ -110,27 +131,60 @@ class DexTalkerLauncher:
             except OSError:
                 self.log_handle = None
                 stdout_target = subprocess.DEVNULL
-            self.process = subprocess.Popen(
+            self._ready_pipe = create_ready_pipe()
+            self.process = spawn(
                 [python_exe, str(self.run_script)],
+                ready_fd=self._ready_pipe[1] if self._ready_pipe else None,
                 cwd=str(self.base_dir),
                 stdout=stdout_target,
                 stderr=subprocess.STDOUT,
                 start_new_session=True
             )
-
-            if self._wait_for_port("127.0.0.1", 7860, timeout=45):
-                self._set_status("Status: Online (http://localhost:7860)", "#00ffcc")
-            else:
-                self._set_status("Status: Failed to start (see launcher.log)", "#ff4b2b")
-                self.is_running = False
+            self._ready_deadline = time.monotonic() + 45
+            self.root.after(100, self._poll_ready)
             
         except Exception as e:
+            # spawn closes the pipe's write end even when it fails; the read
+            # end is ours
+            if self._ready_pipe:
+                with suppress(OSError):
+                    os.close(self._ready_pipe[0])
+                self._ready_pipe = None
+            if self.log_handle:
+                with suppress(OSError):
+                    self.log_handle.close()
+                self.log_handle = None
             self._set_status(f"Status: Error - {str(e)}", "#ff4b2b")
             self.is_running = False
 
+    def _poll_ready(self):
+        """Check readiness without blocking the Tk loop; re-schedules itself until done."""
+        try:
+            if self._ready_pipe:
+                ready = poll_ready(self._ready_pipe[0])
+            elif port_open("127.0.0.1", self.port):
+                ready = True
+            else:
+                ready = False if self.process.poll() is not None else None
+        except OSError:
+            ready = False
+
+        if ready is None and time.monotonic() < self._ready_deadline:
+            self.root.after(250, self._poll_ready)
+            return
+
+        if self._ready_pipe:
+            os.close(self._ready_pipe[0])
+            self._ready_pipe = None
+        if ready:
+            self._set_status(f"Status: Online (http://localhost:{self.port})", "#00ffcc")
+        else:
+            self._set_status("Status: Failed to start (see launcher.log)", "#ff4b2b")
+            self.is_running = False
+
     def open_ui(self):
         import webbrowser
-        webbrowser.open("http://localhost:7860")
+        webbrowser.open(f"http://localhost:{self.port}")
 
     def open_desktop_window(self):
         if self.desktop_process and self.desktop_process.poll() is None:
@@ -149,7 +203,7 @@ class DexTalkerLauncher:
                 self.desktop_log_handle = None
                 stdout_target = subprocess.DEVNULL
 
-            self.desktop_process = subprocess.Popen(
+            self.desktop_process = spawn(
                 [python_exe, str(desktop_app), "--attach"],
                 cwd=str(self.base_dir),
                 stdout=stdout_target,
@@ -160,50 +214,22 @@ class DexTalkerLauncher:
             self.status_label.config(text=f"Status: Desktop window error - {str(e)}", foreground="#ff4b2b")
 
     def clean_ports(self):
-        try:
-            subprocess.run("lsof -ti:7860 | xargs kill -9", shell=True, stderr=subprocess.DEVNULL)
-        except:
-            pass
-
-    def _wait_for_port(self, host, port, timeout=45):
-        deadline = time.time() + timeout
-        while time.time() < deadline:
-            if self.process and self.process.poll() is not None:
-                return False
-            try:
-                with socket.create_connection((host, port), timeout=1):
-                    return True
-            except OSError:
-                time.sleep(0.5)
-        return False
+        with suppress(OSError):
+            kill_port_owners(self.port)
 
     def shutdown_and_quit(self):
         self.status_label.config(text="Status: Shutting down...", foreground="#ff4b2b")
         self.root.update()
         
-        if self.process:
-            try:
-                os.killpg(os.getpgid(self.process.pid), signal.SIGTERM)
-            except:
-                pass
-
-        if self.desktop_process:
-            try:
-                os.killpg(os.getpgid(self.desktop_process.pid), signal.SIGTERM)
-            except:
-                pass
-
-        if self.desktop_log_handle:
-            try:
-                self.desktop_log_handle.close()
-            except:
-                pass
-        
-        if self.log_handle:
-            try:
-                self.log_handle.close()
-            except:
-                pass
+        for proc in (self.process, self.desktop_process):
+            if proc is not None and proc.poll() is None:
+                with suppress(ProcessLookupError, PermissionError):
+                    os.killpg(os.getpgid(proc.pid), signal.SIGTERM)
+
+        for handle in (self.desktop_log_handle, self.log_handle):
+            if handle:
+                with suppress(OSError):
+                    handle.close()
         
         self.clean_ports()
         time.sleep(0.5)
@@ -6,30 +6,27 @@ Just starts the server and opens your browser
 import os
 import sys
 import subprocess
-import time
-import socket
+from contextlib import suppress
 import webbrowser
 from pathlib import Path
 
 BASE_DIR = Path(__file__).resolve().parent.parent
-PORT = 7860
+sys.path.insert(0, str(BASE_DIR))
+
+from app.launcher_utils import (
+    create_ready_pipe, get_configured_port, kill_port_owners, port_open, spawn, wait_for_ready, wait_for_port
+)
+
+PORT = get_configured_port(BASE_DIR)
 
 def check_port(port):
     """Check if server is running on port"""
-    try:
-        with socket.create_connection(("127.0.0.1", port), timeout=1):
-            return True
-    except OSError:
-        return False
+    return port_open("127.0.0.1", port, timeout=1)
 
 def kill_existing():
     """Kill any existing server on the port"""
-    try:
-        subprocess.run(f"lsof -ti:{PORT} | xargs kill -9", 
-                      shell=True, stderr=subprocess.DEVNULL)
-        time.sleep(0.5)
-    except:
-        pass
+    with suppress(OSError):
+        kill_port_owners(PORT)
 
 def main():
     print("=" * 50)
@@ -45,8 +42,10 @@ def main():
     print(f"🔧 Starting DexTalker server on port {PORT}...")
     run_script = BASE_DIR / "run.py"
     
-    process = subprocess.Popen(
+    ready_pipe = create_ready_pipe()
+    process = spawn(
         [sys.executable, str(run_script)],
+        ready_fd=ready_pipe[1] if ready_pipe else None,
         cwd=str(BASE_DIR),
         stdout=subprocess.DEVNULL,
         stderr=subprocess.DEVNULL,
@@ -55,41 +54,44 @@ def main():
     
     # Wait for server to be ready
     print("⏳ Waiting for server to start", end="", flush=True)
-    deadline = time.time() + 45
-    while time.time() < deadline:
-        if check_port(PORT):
-            print(" ✅")
-            print(f"\n🎉 DexTalker is online at http://localhost:{PORT}")
-            print("\n📋 Features available:")
-            print("   • 🎙️  Studio: Text-to-speech generation")
-            print("   • 🗣️  Voices: Manage voice profiles")
-            print("   • 🎬 Video Voice Clone: Create voices from videos")
-            print("   • ⚙️  Network Access: Share over LAN/Tailnet")
-            print("\n🌐 Opening browser...")
-            time.sleep(1)
-            webbrowser.open(f"http://localhost:{PORT}")
-            
-            print("\n💡 Tip: Keep this window open. Close it to stop the server.")
-            print("=" * 50)
-            
-            try:
-                # Keep this script running so user can Ctrl+C to stop
-                while True:
-                    time.sleep(1)
-            except KeyboardInterrupt:
-                print("\n\n🛑 Shutting down DexTalker...")
-                kill_existing()
-                print("👋 Goodbye!\n")
-                sys.exit(0)
-        
-        print(".", end="", flush=True)
-        time.sleep(0.5)
+    if ready_pipe:
+        ready = wait_for_ready(ready_pipe[0], timeout=45)
+    else:
+        ready = wait_for_port("127.0.0.1", PORT, timeout=45, process=process)
+    
+    if not ready:
+        print(" ❌")
+        if process.poll() is not None:
+            print(f"\n⚠️  Server exited during startup (code {process.returncode})")
+        else:
+            print("\n⚠️  Server failed to start within 45 seconds")
+        print("Check the DexTalker folder for error logs")
+        sys.exit(1)
+    
+    print(" ✅")
+    print(f"\n🎉 DexTalker is online at http://localhost:{PORT}")
+    print("\n📋 Features available:")
+    print("   • 🎙️  Studio: Text-to-speech generation")
+    print("   • 🗣️  Voices: Manage voice profiles")
+    print("   • 🎬 Video Voice Clone: Create voices from videos")
+    print("   • ⚙️  Network Access: Share over LAN/Tailnet")
+    print("\n🌐 Opening browser...")
+    webbrowser.open(f"http://localhost:{PORT}")
+    
+    print("\n💡 Tip: Keep this window open. Close it to stop the server.")
+    print("=" * 50)
+    
+    try:
+        # Sleep in the kernel until the server exits or the user hits Ctrl+C
+        returncode = process.wait()
+    except KeyboardInterrupt:
+        print("\n\n🛑 Shutting down DexTalker...")
+        kill_existing()
+        print("👋 Goodbye!\n")
+        sys.exit(0)
     
-    # Timeout
-    print(" ❌")
-    print("\n⚠️  Server failed to start within 45 seconds")
-    print("Check the DexTalker folder for error logs")
-    sys.exit(1)
+    print(f"\n🛑 Server exited (code {returncode})")
+    sys.exit(returncode)
 
 if __name__ == "__main__":
     try:
@@ -0,0 +1,306 @@
+"""
+Shared helpers for the DexTalker launchers.
+
+The launchers start ``run.py`` in a child process and need to know when the
+server is accepting connections. On POSIX the child signals readiness over an
+inherited pipe, so the launcher sleeps in the kernel until the server is up or
+the child exits. Where that is not available, fall back to probing the port.
+"""
+import errno
+import json
+import os
+import select
+import selectors
+import signal
+import socket
+import subprocess
+import threading
+import time
+from typing import Optional, Tuple
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+READY_FD_ENV = "DEXTALKER_READY_FD"
+DEFAULT_PORT = 7860
+
+# {config path: ((mtime_ns, size), parsed config)}
+_config_cache = {}
+# {base_dir string: config path}
+_config_paths = {}
+
+
+def _config_path(base_dir) -> str:
+    key = os.fspath(base_dir)
+    path = _config_paths.get(key)
+    if path is None:
+        path = _config_paths[key] = os.path.join(key, "data", "network_auth.json")
+    return path
+
+
+def _load_network_config(base_dir) -> dict:
+    """Read data/network_auth.json under base_dir, re-parsing only when the file changes."""
+    path = _config_path(base_dir)
+    try:
+        st = os.stat(path)
+    except OSError:
+        return {}
+    stamp = (st.st_mtime_ns, st.st_size)
+    hit = _config_cache.get(path)
+    if hit is not None and hit[0] == stamp:
+        return hit[1]
+    try:
+        with open(path, "rb") as f:
+            raw = f.read()
+        data = orjson.loads(raw) if orjson is not None else json.loads(raw)
+    except (OSError, ValueError):
+        return {}
+    _config_cache[path] = (stamp, data)
+    return data
+
+
+def get_configured_port(base_dir) -> int:
+    """
+    Return the server port configured in the app's network settings.
+
+    Args:
+        base_dir: DexTalker root directory (the one containing run.py)
+
+    Returns:
+        int: Configured port, or DEFAULT_PORT if unset or unreadable
+    """
+    config = _load_network_config(base_dir).get("config", {})
+    try:
+        return int(config.get("port", DEFAULT_PORT))
+    except (TypeError, ValueError):
+        return DEFAULT_PORT
+
+
+def create_ready_pipe() -> Optional[Tuple[int, int]]:
+    """
+    Create the (read_fd, write_fd) pipe a launched server uses to report readiness.
+
+    Returns:
+        The pipe fds, or None where fds cannot be passed to a child (Windows).
+    """
+    if os.name != "posix":
+        return None
+    return os.pipe()
+
+
+# Serializes spawns so a ready fd made inheritable for one child cannot
+# leak into another child started concurrently from a different thread.
+_spawn_lock = threading.Lock()
+
+
+def spawn(args, ready_fd: Optional[int] = None, **kwargs) -> subprocess.Popen:
+    """
+    Start a child process without the close_fds sweep.
+
+    close_fds=True makes the child close every fd up to RLIMIT_NOFILE, which
+    is very large on macOS. Python creates fds non-inheritable, so the only fd
+    that needs to cross is the ready pipe, which is marked inheritable here.
+
+    Args:
+        args: Program and arguments, as for subprocess.Popen
+        ready_fd: Write end from create_ready_pipe; handed to the child via
+            READY_FD_ENV and closed in the parent
+        **kwargs: Passed through to subprocess.Popen
+
+    Returns:
+        subprocess.Popen: The started process
+    """
+    env = dict(kwargs.pop("env", None) or os.environ)
+    with _spawn_lock:
+        try:
+            if ready_fd is not None:
+                os.set_inheritable(ready_fd, True)
+                env[READY_FD_ENV] = str(ready_fd)
+            return subprocess.Popen(args, close_fds=False, env=env, **kwargs)
+        finally:
+            if ready_fd is not None:
+                # Only the child holds the write end now, so its exit means EOF
+                os.close(ready_fd)
+
+
+def wait_for_ready(read_fd: int, timeout: float = 45) -> bool:
+    """
+    Block until the server writes to the ready pipe.
+
+    The write end is closed when the child exits, so a crashed server wakes
+    the wait immediately with EOF instead of running out the timeout.
+
+    Args:
+        read_fd: Read end of the pipe from create_ready_pipe (closed on return)
+        timeout: Seconds to wait
+
+    Returns:
+        bool: True if the server reported ready
+    """
+    try:
+        with selectors.DefaultSelector() as selector:
+            selector.register(read_fd, selectors.EVENT_READ)
+            if not selector.select(timeout):
+                return False
+            return os.read(read_fd, 1) == b"1"
+    finally:
+        os.close(read_fd)
+
+
+def poll_ready(read_fd: int) -> Optional[bool]:
+    """
+    Non-blocking check of the ready pipe, for callers driving their own event loop.
+
+    Returns:
+        True if the server reported ready, False if it exited first,
+        None if it is still starting
+    """
+    readable, _, _ = select.select([read_fd], [], [], 0)
+    if not readable:
+        return None
+    return os.read(read_fd, 1) == b"1"
+
+
+def port_open(host: str, port: int, timeout: float = 0.05) -> bool:
+    """Return True if something accepts a connection on host:port within timeout."""
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    try:
+        sock.setblocking(False)
+        err = sock.connect_ex((host, port))
+        if err in (0, errno.EISCONN):
+            return True
+        if err not in (errno.EINPROGRESS, errno.EWOULDBLOCK, errno.EALREADY):
+            # Refused outright (nothing listening on loopback)
+            return False
+        _, writable, _ = select.select([], [sock], [], timeout)
+        return bool(writable) and sock.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR) == 0
+    except OSError:
+        return False
+    finally:
+        sock.close()
+
+
+def signal_ready() -> None:
+    """Tell the launcher that started this process that the server is up."""
+    fd = os.environ.pop(READY_FD_ENV, None)
+    if fd is None:
+        return
+    try:
+        os.write(int(fd), b"1")
+        os.close(int(fd))
+    except (OSError, ValueError):
+        pass
+
+
+def wait_for_port(host: str, port: int, timeout: float = 45, process=None) -> bool:
+    """
+    Poll until something accepts connections on host:port, backing off
+    exponentially from 50ms to 1s between attempts.
+
+    Args:
+        host: Host to connect to
+        port: Port to connect to
+        timeout: Seconds to wait
+        process: Optional Popen; stop early if it exits
+
+    Returns:
+        bool: True if the port accepted a connection
+    """
+    deadline = time.monotonic() + timeout
+    delay = 0.05
+    while True:
+        if process is not None and process.poll() is not None:
+            return False
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return False
+        # A refused connect fails immediately, so the backoff is what paces
+        # retries; an in-flight handshake gets up to `delay` to complete.
+        started = time.monotonic()
+        if port_open(host, port, timeout=min(delay, remaining)):
+            return True
+        time.sleep(max(0.0, min(delay, remaining) - (time.monotonic() - started)))
+        delay = min(delay * 1.6, 1.0)
+
+
+def _port_bindable(port: int) -> bool:
+    # Wildcard bind and no SO_REUSEADDR: with it, macOS/BSD let the bind
+    # succeed while a server listens on 0.0.0.0 (LAN/Tailnet mode), and the
+    # port would look free with its owner still running.
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        try:
+            sock.bind(("0.0.0.0", port))
+        except OSError:
+            return False
+    return True
+
+
+def _port_owner_pids(port: int) -> set:
+    """PIDs holding `port`, via psutil when permitted, otherwise lsof."""
+    try:
+        import psutil
+        pids = {
+            conn.pid
+            for conn in psutil.net_connections(kind="inet")
+            if conn.laddr and conn.laddr.port == port and conn.pid
+        }
+    except Exception:
+        # psutil missing, or listing connections needs privileges (macOS)
+        try:
+            out = subprocess.check_output(
+                ["lsof", "-ti", f":{port}"], stderr=subprocess.DEVNULL, timeout=2
+            )
+        except (OSError, subprocess.CalledProcessError, subprocess.TimeoutExpired):
+            return set()
+        pids = {int(pid) for pid in out.split() if pid.isdigit()}
+    pids.discard(os.getpid())
+    return pids
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+def kill_port_owners(port: int, grace: float = 0.5) -> None:
+    """
+    Stop whatever process is holding a TCP port.
+
+    Sends SIGTERM, gives the owners `grace` seconds to exit, then SIGKILLs
+    survivors. Owners are found with psutil when it is installed and
+    permitted to list connections, otherwise with lsof.
+
+    Args:
+        port: TCP port to free
+        grace: Seconds to wait between SIGTERM and SIGKILL
+    """
+    if _port_bindable(port):
+        # Nobody owns it; skip the process scan entirely.
+        return
+
+    pids = _port_owner_pids(port)
+    for pid in pids:
+        try:
+            os.kill(pid, signal.SIGTERM)
+        except ProcessLookupError:
+            pass
+
+    deadline = time.monotonic() + grace
+    while pids and time.monotonic() < deadline:
+        time.sleep(0.05)
+        if _port_bindable(port):
+            return
+        pids = {pid for pid in pids if _pid_alive(pid)}
+
+    for pid in pids:
+        try:
+            os.kill(pid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
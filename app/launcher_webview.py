@@ -1,15 +1,21 @@
+import asyncio
+import json
 import os
 import sys
-import subprocess
 import socket
 import threading
 import time
 import signal
+from contextlib import suppress
 from pathlib import Path
 import webview
 
 # Constants
 BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BASE_DIR))
+
+from app.launcher_utils import get_configured_port, kill_port_owners, port_open
+
 PYTHON_EXE = sys.executable
 
 class LauncherAPI:
@@ -18,71 +24,127 @@ class LauncherAPI:
         self.process = None
         self.desktop_process = None
         self.is_starting = False
+        self.port = get_configured_port(BASE_DIR)
+        # Process management runs on a private loop so JS bridge calls never
+        # block on fork/exec or on waiting for children.
+        self._loop = asyncio.new_event_loop()
+        self._loop_thread = threading.Thread(target=self._loop.run_forever, daemon=True)
+        self._loop_thread.start()
+
+    def _run(self, coro):
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result()
+
+    @staticmethod
+    def _alive(proc):
+        return proc is not None and proc.returncode is None
 
     def get_status(self):
-        if self.process and self.process.poll() is None:
-            return {"status": "Online", "color": "#00ffcc", "url": "http://localhost:7860"}
-        return {"status": "Offline", "color": "#ff4b2b", "url": ""}
+        if not self._alive(self.process):
+            return {"status": "Offline", "color": "#ff4b2b", "url": ""}
+        if self.is_starting:
+            return {"status": "Starting", "color": "#ffcc00", "url": ""}
+        return {"status": "Online", "color": "#00ffcc", "url": f"http://localhost:{self.port}"}
+
+    async def _push_status(self):
+        js = f"applyStatus({json.dumps(self.get_status())})"
+        # evaluate_js waits for the page, so keep it off the loop; the
+        # window may already be gone during shutdown.
+        with suppress(Exception):
+            await asyncio.to_thread(self.window.evaluate_js, js)
+
+    async def _watch(self, proc):
+        """Push Starting -> Online -> Offline to the page as `proc` moves through them."""
+        await self._push_status()
+        exited = asyncio.ensure_future(proc.wait())
+        delay = 0.05
+        while not exited.done() and not port_open("127.0.0.1", self.port):
+            # Sleep by waiting on the exit, so a crash is reported immediately
+            await asyncio.wait({exited}, timeout=delay)
+            delay = min(delay * 1.6, 1.0)
+        if proc is self.process:
+            self.is_starting = False
+            if not exited.done():
+                await self._push_status()
+            await exited
+            await self._push_status()
 
     def launch_ui(self):
         import webbrowser
-        webbrowser.open("http://localhost:7860")
+        webbrowser.open(f"http://localhost:{self.port}")
         return True
 
     def launch_desktop(self):
-        if self.desktop_process and self.desktop_process.poll() is None:
+        return self._run(self._launch_desktop())
+
+    async def _launch_desktop(self):
+        if self._alive(self.desktop_process):
             return False
             
         desktop_script = BASE_DIR / "app" / "desktop_app.py"
-        self.desktop_process = subprocess.Popen(
-            [PYTHON_EXE, str(desktop_script), "--attach"],
+        self.desktop_process = await asyncio.create_subprocess_exec(
+            PYTHON_EXE, str(desktop_script), "--attach",
             cwd=str(BASE_DIR),
-            start_new_session=True
+            start_new_session=True,
+            close_fds=False
         )
         return True
 
     def start_engine(self):
-        if self.process and self.process.poll() is None:
+        return self._run(self._start_engine())
+
+    async def _start_engine(self):
+        if self._alive(self.process):
             return False
             
         self.is_starting = True
         run_script = BASE_DIR / "run.py"
         
+        # Settings may have changed since the launcher opened
+        self.port = get_configured_port(BASE_DIR)
+        
         # Kill existing if any
-        self.clean_ports()
+        await self._clean_ports()
         
-        self.process = subprocess.Popen(
-            [PYTHON_EXE, str(run_script)],
+        self.process = await asyncio.create_subprocess_exec(
+            PYTHON_EXE, str(run_script),
             cwd=str(BASE_DIR),
-            stdout=subprocess.PIPE,
-            stderr=subprocess.STDOUT,
-            start_new_session=True
+            stdout=asyncio.subprocess.DEVNULL,
+            stderr=asyncio.subprocess.STDOUT,
+            start_new_session=True,
+            close_fds=False
         )
-        
-        # Wait for port in a separate check (triggered by UI polling)
+        self._loop.create_task(self._watch(self.process))
         return True
 
     def clean_ports(self):
-        try:
-            subprocess.run("lsof -ti:7860 | xargs kill -9", shell=True, stderr=subprocess.DEVNULL)
-        except:
-            pass
+        return self._run(self._clean_ports())
+
+    async def _clean_ports(self):
+        with suppress(OSError):
+            await asyncio.to_thread(kill_port_owners, self.port)
 
     def shutdown(self):
-        if self.process:
-            try:
-                os.killpg(os.getpgid(self.process.pid), signal.SIGTERM)
-            except:
-                pass
-        if self.desktop_process:
-            try:
-                os.killpg(os.getpgid(self.desktop_process.pid), signal.SIGTERM)
-            except:
-                pass
-        self.clean_ports()
+        self._run(self._shutdown())
+        self._loop.call_soon_threadsafe(self._loop.stop)
         self.window.destroy()
         sys.exit(0)
 
+    async def _terminate(self, proc):
+        """SIGTERM the process group, escalating to SIGKILL if it has not exited in 3s."""
+        if not self._alive(proc):
+            return
+        with suppress(ProcessLookupError, PermissionError):
+            os.killpg(os.getpgid(proc.pid), signal.SIGTERM)
+            try:
+                await asyncio.wait_for(proc.wait(), timeout=3)
+            except asyncio.TimeoutError:
+                os.killpg(os.getpgid(proc.pid), signal.SIGKILL)
+                await proc.wait()
+
+    async def _shutdown(self):
+        await asyncio.gather(self._terminate(self.process), self._terminate(self.desktop_process))
+        await self._clean_ports()
+
 HTML = """
 <!DOCTYPE html>
 <html>
@@ -179,8 +241,8 @@ HTML = """
     </div>
 
     <script>
-        async function updateStatus() {
-            const result = await pywebview.api.get_status();
+        // Status changes are pushed from Python via evaluate_js
+        function applyStatus(result) {
             document.getElementById('status-text').innerText = 'Status: ' + result.status;
             const dot = document.getElementById('dot');
             if (result.status === 'Online') {
@@ -197,9 +259,9 @@ HTML = """
 
         // Start engine on boot
         window.addEventListener('pywebviewready', () => {
-            pywebview.api.start_engine();
-            setInterval(updateStatus, 1500);
             document.getElementById('loader').style.display = 'block';
+            pywebview.api.get_status().then(applyStatus);
+            pywebview.api.start_engine();
         });
     </script>
 </body>
@@ -8,7 +8,8 @@ from .utils import (
     is_lan_ip,
     generate_shareable_urls,
     check_port_available,
-    get_tailscale_status
+    get_tailscale_status,
+    invalidate_network_cache
 )
 from .auth import (
     NetworkAuth,
@@ -26,6 +27,7 @@ __all__ = [
     'generate_shareable_urls',
     'check_port_available',
     'get_tailscale_status',
+    'invalidate_network_cache',
     'NetworkAuth',
     'generate_access_token',
     'verify_access_token'
@@ -2,16 +2,38 @@
 Authentication system for DexTalker network access.
 Provides token-based auth and access control for LAN/Tailnet connections.
 """
+import hmac
+import os
 import secrets
 import logging
+from functools import lru_cache
 from typing import Optional, Dict
-from datetime import datetime, timedelta
+import time
 from pathlib import Path
 import json
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+from .utils import is_localhost, is_tailscale_ip, is_lan_ip
+
 logger = logging.getLogger("DexTalker.Auth")
 
 
+@lru_cache(maxsize=1024)
+def _classify_ip(ip: str) -> str:
+    """Classify a client IP as 'localhost', 'tailnet', 'lan' or 'other'."""
+    if is_localhost(ip):
+        return "localhost"
+    if is_tailscale_ip(ip):
+        return "tailnet"
+    if is_lan_ip(ip):
+        return "lan"
+    return "other"
+
+
 def generate_access_token() -> str:
     """
     Generate a cryptographically secure access token.
@@ -50,6 +72,7 @@ class NetworkAuth:
         """
         self.data_dir = Path(data_dir)
         self.auth_file = self.data_dir / "network_auth.json"
+        self._auth_path = str(self.auth_file)
         self.access_token = None
         self.config = {
             "lan_enabled": False,
@@ -62,22 +85,34 @@ class NetworkAuth:
         
         self._load_config()
     
+    def _apply_config(self):
+        """Mirror the config flags checked on every request as plain attributes."""
+        self._lan_enabled = self.config["lan_enabled"]
+        self._tailnet_enabled = self.config["tailnet_enabled"]
+        self._tailnet_only = self.config["tailnet_only"]
+        self._require_login = self.config["require_login"]
+    
     def _load_config(self):
         """Load auth configuration from file."""
-        if self.auth_file.exists():
+        if os.path.exists(self._auth_path):
             try:
-                with open(self.auth_file, 'r') as f:
-                    data = json.load(f)
+                with open(self._auth_path, 'rb') as f:
+                    raw = f.read()
+                    data = orjson.loads(raw) if orjson is not None else json.loads(raw)
                     self.access_token = data.get("access_token")
                     self.config.update(data.get("config", {}))
                     logger.info("Loaded network auth configuration")
             except Exception as e:
                 logger.error(f"Failed to load auth config: {e}")
         
+        self._apply_config()
+        
         # Generate token if missing
         if not self.access_token:
             self.access_token = generate_access_token()
             self._save_config()
+        
+        self._expected_token = self.access_token.encode("utf-8")
     
     def _save_config(self):
         """Save auth configuration to file."""
@@ -86,11 +121,24 @@ class NetworkAuth:
             data = {
                 "access_token": self.access_token,
                 "config": self.config,
-                "last_updated": datetime.now().isoformat()
+                "last_updated": time.strftime("%Y-%m-%dT%H:%M:%S")
             }
             
-            with open(self.auth_file, 'w') as f:
-                json.dump(data, f, indent=2)
+            if orjson is not None:
+                payload = orjson.dumps(data, option=orjson.OPT_INDENT_2)
+            else:
+                payload = json.dumps(data, indent=2).encode("utf-8")
+            
+            # Write a private temp file and rename it over the config, so
+            # readers never see a partially written file. The token makes
+            # this a secret, hence 0o600; no fsync since it is regenerable.
+            tmp = self._auth_path + ".tmp"
+            fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            try:
+                os.write(fd, payload)
+            finally:
+                os.close(fd)
+            os.replace(tmp, self._auth_path)
                 
             logger.info("Saved network auth configuration")
         except Exception as e:
@@ -104,6 +152,7 @@ class NetworkAuth:
             str: New access token
         """
         self.access_token = generate_access_token()
+        self._expected_token = self.access_token.encode("utf-8")
         self._save_config()
         logger.info("Regenerated access token")
         return self.access_token
@@ -113,8 +162,10 @@ class NetworkAuth:
         Update network configuration.
         
         Args:
-            **kwargs: Configuration keys to update
+            **kwargs: Configuration keys to update; pass them all in one
+                call, each call that changes something rewrites the file
         """
+        previous = dict(self.config)
         for key, value in kwargs.items():
             if key in self.config:
                 self.config[key] = value
@@ -125,6 +176,11 @@ class NetworkAuth:
         else:
             self.config["bind_address"] = "127.0.0.1"
         
+        if self.config == previous:
+            # Nothing changed; skip the file rewrite
+            return
+        
+        self._apply_config()
         self._save_config()
         logger.info(f"Updated network config: {kwargs}")
     
@@ -139,39 +195,44 @@ class NetworkAuth:
         Returns:
             Tuple of (allowed: bool, reason: str)
         """
-        from .utils import is_localhost, is_tailscale_ip, is_lan_ip
+        # Only the IP classification is memoized; the token is compared
+        # afresh on every call so secrets are never kept as cache keys.
+        kind = _classify_ip(client_ip)
         
         # Localhost always allowed
-        if is_localhost(client_ip):
+        if kind == "localhost":
             return True, "localhost"
         
+        lan_enabled = self._lan_enabled
+        tailnet_enabled = self._tailnet_enabled
+        
         # Check if network access is enabled
-        if not self.config["lan_enabled"] and not self.config["tailnet_enabled"]:
+        if not lan_enabled and not tailnet_enabled:
             return False, "Network access disabled"
         
         # Check token if required
-        if self.config["require_login"]:
+        if self._require_login:
             if not provided_token:
                 return False, "Authentication required"
-            
-            if not verify_access_token(provided_token, self.access_token):
+            # Token length is not secret, so a mismatch can skip the compare
+            provided = provided_token.encode("utf-8")
+            expected = self._expected_token
+            if len(provided) != len(expected) or not hmac.compare_digest(provided, expected):
                 return False, "Invalid token"
         
         # Check Tailnet-only mode
-        if self.config["tailnet_only"]:
-            if not is_tailscale_ip(client_ip):
+        if self._tailnet_only:
+            if kind != "tailnet":
                 return False, "Tailnet-only mode enabled"
             return True, "tailnet"
         
-        # Check Tailnet access
-        if is_tailscale_ip(client_ip):
-            if self.config["tailnet_enabled"]:
+        if kind == "tailnet":
+            if tailnet_enabled:
                 return True, "tailnet"
             return False, "Tailnet access disabled"
         
-        # Check LAN access
-        if is_lan_ip(client_ip):
-            if self.config["lan_enabled"]:
+        if kind == "lan":
+            if lan_enabled:
                 return True, "lan"
             return False, "LAN access disabled"
         
@@ -6,12 +6,71 @@ import socket
 import subprocess
 import json
 import logging
-from typing import List, Optional, Dict
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import wraps
+from typing import Any, Callable, List, Optional, Dict, Tuple
 import ipaddress
 
 logger = logging.getLogger("DexTalker.Network")
 
 
+def _int_range(cidr: str) -> tuple:
+    net = ipaddress.IPv4Network(cidr)
+    return int(net.network_address), int(net.broadcast_address)
+
+
+# Address ranges as (first, last) integers so membership is two compares
+_TAILNET_RANGE = _int_range("100.64.0.0/10")
+_LAN_RANGES = tuple(_int_range(cidr) for cidr in ("10.0.0.0/8", "172.16.0.0/12", "192.168.0.0/16"))
+_LOCALHOST_NAMES = frozenset(("127.0.0.1", "::1", "localhost"))
+
+
+def _ipv4_int(ip: str) -> Optional[int]:
+    """Parse a dotted-quad IPv4 address to an int, or None if it is not one."""
+    if not isinstance(ip, str):
+        return None
+    # Longer than "255.255.255.255": reject without encoding/parsing it
+    if len(ip) > 15:
+        return None
+    # inet_pton is C and, unlike inet_aton, rejects shorthand like "10.1"
+    try:
+        return int.from_bytes(socket.inet_pton(socket.AF_INET, ip), "big")
+    except (OSError, ValueError):
+        return None
+
+# {function name: (expiry, result)} for the subprocess/socket-backed lookups
+_TTL_CACHE: Dict[str, Tuple[float, Any]] = {}
+
+
+def _ttl_cached(ttl: float) -> Callable:
+    """Reuse a no-argument function's result for `ttl` seconds."""
+    def decorator(fn):
+        key = fn.__name__
+
+        @wraps(fn)
+        def wrapper():
+            hit = _TTL_CACHE.get(key)
+            now = time.monotonic()
+            if hit is not None and hit[0] > now:
+                return hit[1]
+            result = fn()
+            _TTL_CACHE[key] = (now + ttl, result)
+            return result
+        return wrapper
+    return decorator
+
+
+# Runs the LAN probe alongside the Tailscale subprocess; threads start lazily
+_PROBE_EXECUTOR = ThreadPoolExecutor(max_workers=2, thread_name_prefix="DexTalkerNetProbe")
+
+
+def invalidate_network_cache() -> None:
+    """Drop cached IP/Tailscale lookups, e.g. after the network changes."""
+    _TTL_CACHE.clear()
+
+
+@_ttl_cached(5.0)
 def get_local_ip() -> str:
     """
     Get primary LAN IPv4 address.
@@ -20,12 +79,13 @@ def get_local_ip() -> str:
         str: Primary LAN IP or 127.0.0.1 if unavailable
     """
     try:
-        # Connect to external DNS to determine which interface to use
-        s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-        s.settimeout(1)
-        s.connect(("8.8.8.8", 80))
-        ip = s.getsockname()[0]
-        s.close()
+        # "Connecting" a UDP socket only asks the kernel which interface
+        # routes to that address: no packet is sent and nothing can block,
+        # so it fails fast (ENETUNREACH) when there is no route.
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as s:
+            s.setblocking(False)
+            s.connect(("8.8.8.8", 80))
+            ip = s.getsockname()[0]
         
         # Verify it's not loopback
         if ip.startswith("127."):
@@ -38,35 +98,64 @@ def get_local_ip() -> str:
         return "127.0.0.1"
 
 
-def get_tailscale_ip() -> Optional[str]:
+@_ttl_cached(5.0)
+def _tailscale_self() -> Dict[str, Any]:
     """
-    Detect Tailscale IPv4 address if available.
+    Run `tailscale status --json` once and summarize it for the helpers below.
     
     Returns:
-        Optional[str]: Tailscale IP (100.x.x.x) or None
+        Dict with keys: installed, running, self (the "Self" node dict), error
     """
+    info = {"installed": False, "running": False, "self": {}, "error": None}
     try:
         result = subprocess.run(
-            ["tailscale", "ip", "-4"],
+            ["tailscale", "status", "--json"],
             capture_output=True,
             text=True,
             timeout=2
         )
+        info["installed"] = True
+        
+        if result.returncode != 0:
+            info["error"] = "Tailscale not connected"
+            return info
         
-        if result.returncode == 0:
-            ip = result.stdout.strip()
-            # Verify it's in Tailscale range
-            if ip.startswith("100."):
-                logger.info(f"Detected Tailscale IP: {ip}")
-                return ip
-                
+        data = json.loads(result.stdout)
+        info["self"] = data.get("Self") or {}
+        if data.get("BackendState", "Running") == "Running":
+            info["running"] = True
+        else:
+            info["error"] = "Tailscale not connected"
+            
     except FileNotFoundError:
         logger.debug("Tailscale not installed")
+        info["error"] = "Tailscale not installed"
     except subprocess.TimeoutExpired:
-        logger.warning("Tailscale command timed out")
+        logger.warning("Tailscale status check timed out")
+        info["installed"] = True
+        info["error"] = "Tailscale check timed out"
+    except json.JSONDecodeError as e:
+        logger.debug(f"Failed to parse Tailscale status: {e}")
+        info["error"] = "Unreadable Tailscale status"
     except Exception as e:
         logger.debug(f"Tailscale detection failed: {e}")
+        info["error"] = str(e)
+    
+    return info
+
+
+def get_tailscale_ip() -> Optional[str]:
+    """
+    Detect Tailscale IPv4 address if available.
     
+    Returns:
+        Optional[str]: Tailscale IP (100.x.x.x) or None
+    """
+    for ip in _tailscale_self()["self"].get("TailscaleIPs") or ():
+        # First IPv4 address, verified to be in Tailscale range
+        if ":" not in ip and ip.startswith("100."):
+            logger.info(f"Detected Tailscale IP: {ip}")
+            return ip
     return None
 
 
@@ -77,31 +166,10 @@ def get_magicDNS_hostname() -> Optional[str]:
     Returns:
         Optional[str]: MagicDNS hostname or None
     """
-    try:
-        result = subprocess.run(
-            ["tailscale", "status", "--json"],
-            capture_output=True,
-            text=True,
-            timeout=2
-        )
-        
-        if result.returncode == 0:
-            data = json.loads(result.stdout)
-            hostname = data.get("Self", {}).get("DNSName", "").rstrip(".")
-            
-            if hostname:
-                logger.info(f"Detected MagicDNS: {hostname}")
-                return hostname
-                
-    except FileNotFoundError:
-        logger.debug("Tailscale not installed")
-    except subprocess.TimeoutExpired:
-        logger.warning("Tailscale status check timed out")
-    except (json.JSONDecodeError, KeyError) as e:
-        logger.debug(f"Failed to parse Tailscale status: {e}")
-    except Exception as e:
-        logger.debug(f"MagicDNS detection failed: {e}")
-    
+    hostname = (_tailscale_self()["self"].get("DNSName") or "").rstrip(".")
+    if hostname:
+        logger.info(f"Detected MagicDNS: {hostname}")
+        return hostname
     return None
 
 
@@ -115,12 +183,14 @@ def is_tailscale_ip(ip: str) -> bool:
     Returns:
         bool: True if IP is in Tailscale range
     """
-    try:
-        addr = ipaddress.ip_address(ip)
-        tailnet = ipaddress.ip_network("100.64.0.0/10")
-        return addr in tailnet
-    except (ValueError, ipaddress.AddressValueError):
+    # Nearly all clients are rejected here without parsing anything
+    if not isinstance(ip, str) or not ip.startswith("100."):
+        return False
+    n = _ipv4_int(ip)
+    if n is None:
         return False
+    first, last = _TAILNET_RANGE
+    return first <= n <= last
 
 
 def is_localhost(ip: str) -> bool:
@@ -133,7 +203,7 @@ def is_localhost(ip: str) -> bool:
     Returns:
         bool: True if localhost
     """
-    return ip in ["127.0.0.1", "::1", "localhost"]
+    return ip in _LOCALHOST_NAMES
 
 
 def is_lan_ip(ip: str) -> bool:
@@ -146,19 +216,10 @@ def is_lan_ip(ip: str) -> bool:
     Returns:
         bool: True if private LAN IP
     """
-    try:
-        addr = ipaddress.ip_address(ip)
-        
-        # Check private ranges
-        private_ranges = [
-            ipaddress.ip_network("10.0.0.0/8"),
-            ipaddress.ip_network("172.16.0.0/12"),
-            ipaddress.ip_network("192.168.0.0/16"),
-        ]
-        
-        return any(addr in network for network in private_ranges)
-    except (ValueError, ipaddress.AddressValueError):
+    n = _ipv4_int(ip)
+    if n is None:
         return False
+    return any(first <= n <= last for first, last in _LAN_RANGES)
 
 
 def generate_shareable_urls(port: int, protocol: str = "http") -> Dict[str, Optional[str]]:
@@ -172,30 +233,38 @@ def generate_shareable_urls(port: int, protocol: str = "http") -> Dict[str, Opti
     Returns:
         Dict with keys: localhost, lan, tailscale, magicDNS
     """
-    urls = {
-        "localhost": f"{protocol}://127.0.0.1:{port}",
-        "lan": None,
-        "tailscale": None,
-        "magicDNS": None
-    }
+    # Same TTL as the probes underneath; flushed by invalidate_network_cache()
+    cache_key = f"generate_shareable_urls:{protocol}:{port}"
+    hit = _TTL_CACHE.get(cache_key)
+    if hit is not None and hit[0] > time.monotonic():
+        return dict(hit[1])
     
-    # LAN IP
-    lan_ip = get_local_ip()
-    if lan_ip != "127.0.0.1":
-        urls["lan"] = f"{protocol}://{lan_ip}:{port}"
+    prefix = f"{protocol}://"
+    suffix = f":{port}"
     
-    # Tailscale IP
-    ts_ip = get_tailscale_ip()
-    if ts_ip:
-        urls["tailscale"] = f"{protocol}://{ts_ip}:{port}"
+    # The LAN and Tailscale probes are independent, so overlap them
+    lan_future = _PROBE_EXECUTOR.submit(get_local_ip)
+    _tailscale_self()
     
-    # MagicDNS hostname
+    try:
+        lan_ip = lan_future.result(timeout=3)
+    except Exception as e:
+        logger.warning(f"LAN IP probe failed: {e}")
+        lan_ip = "127.0.0.1"
+    # Tailscale IP and MagicDNS are answered from the status fetched above
+    ts_ip = get_tailscale_ip()
     magic = get_magicDNS_hostname()
-    if magic:
-        urls["magicDNS"] = f"{protocol}://{magic}:{port}"
+    
+    urls = {
+        "localhost": prefix + "127.0.0.1" + suffix,
+        "lan": prefix + lan_ip + suffix if lan_ip != "127.0.0.1" else None,
+        "tailscale": prefix + ts_ip + suffix if ts_ip else None,
+        "magicDNS": prefix + magic + suffix if magic else None
+    }
+    _TTL_CACHE[cache_key] = (time.monotonic() + 5.0, urls)
     
     logger.info(f"Generated shareable URLs: {urls}")
-    return urls
+    return dict(urls)
 
 
 def check_port_available(port: int, host: str = "0.0.0.0") -> bool:
@@ -209,16 +278,17 @@ def check_port_available(port: int, host: str = "0.0.0.0") -> bool:
     Returns:
         bool: True if port is available
     """
-    try:
-        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        sock.settimeout(1)
-        sock.bind((host, port))
-        sock.close()
-        return True
-    except OSError:
-        return False
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        # No SO_REUSEADDR: on macOS/BSD it lets a wildcard bind succeed
+        # while the server listens on 127.0.0.1, hiding a running server.
+        try:
+            sock.bind((host, port))
+        except OSError:
+            return False
+    return True
 
 
+@_ttl_cached(30.0)
 def get_tailscale_status() -> Dict[str, any]:
     """
     Get Tailscale connection status.
@@ -226,38 +296,17 @@ def get_tailscale_status() -> Dict[str, any]:
     Returns:
         Dict with status information
     """
+    info = _tailscale_self()
     status = {
-        "installed": False,
-        "running": False,
+        "installed": info["installed"],
+        "running": info["running"],
         "ip": None,
         "hostname": None,
-        "error": None
+        "error": info["error"]
     }
     
-    try:
-        # Check if installed
-        result = subprocess.run(
-            ["tailscale", "status"],
-            capture_output=True,
-            text=True,
-            timeout=2
-        )
-        
-        status["installed"] = True
-        
-        if result.returncode == 0:
-            status["running"] = True
-            status["ip"] = get_tailscale_ip()
-            status["hostname"] = get_magicDNS_hostname()
-        else:
-            status["error"] = "Tailscale not connected"
-            
-    except FileNotFoundError:
-        status["error"] = "Tailscale not installed"
-    except subprocess.TimeoutExpired:
-        status["installed"] = True
-        status["error"] = "Tailscale check timed out"
-    except Exception as e:
-        status["error"] = str(e)
+    if status["running"]:
+        status["ip"] = get_tailscale_ip()
+        status["hostname"] = get_magicDNS_hostname()
     
     return status
@@ -1,12 +1,19 @@
+import asyncio
+import logging
+import os
 import gradio as gr
 from pathlib import Path
 from datetime import datetime
 from app.engine.chatterbox import ChatterboxEngine
 from app.utils import (
     get_text_stats, format_duration, preprocess_text,
-    get_text_presets, get_voice_metadata
+    get_text_presets, get_voice_metadata, configure_logging
 )
 from app.network import NetworkAuth, generate_shareable_urls
+from app.launcher_utils import signal_ready
+
+configure_logging()
+logger = logging.getLogger("DexTalker.UI")
 
 # Initialize Engine
 engine = ChatterboxEngine()
@@ -61,8 +68,10 @@ def regenerate_access_token_handler():
 
 def get_network_status():
     """Get network connectivity status."""
-    from app.network.utils import get_tailscale_status, check_port_available
+    from app.network.utils import get_tailscale_status, check_port_available, invalidate_network_cache
     
+    # An explicit status check should see the network as it is now
+    invalidate_network_cache()
     config = network_auth.get_config()
     port = config["port"]
     
@@ -154,8 +163,24 @@ button[aria-label="Language"],
 """
 
 
+# (voices dir mtime_ns, choices) from the last _load_voice_choices call
+_voice_choices_cache = None
+
+
 def _load_voice_choices():
-    return engine.get_available_voices()
+    """Voice dropdown choices, re-read only when the voices directory changes."""
+    global _voice_choices_cache
+    try:
+        mtime_ns = os.stat(engine.voices_dir).st_mtime_ns
+    except OSError:
+        mtime_ns = None
+    if mtime_ns is not None and _voice_choices_cache is not None and _voice_choices_cache[0] == mtime_ns:
+        return list(_voice_choices_cache[1])
+    
+    choices = engine.get_available_voices()
+    if mtime_ns is not None:
+        _voice_choices_cache = (mtime_ns, choices)
+    return list(choices)
 
 
 def get_engine_status_display():
@@ -270,24 +295,40 @@ async def record_voice_handler(duration_sec, progress=gr.Progress()):
 
 
 async def add_voice_handler(voice_name, voice_upload, recorded_path):
+    global _voice_table_cache, _voice_choices_cache
     source_path = recorded_path or voice_upload
     if not source_path:
         return "❌ Record or upload a voice sample.", gr.update(), gr.update(), gr.update()
 
     success, msg = await engine.add_voice(voice_name, source_path)
+    # An overwritten voice does not change the directory mtime, so drop
+    # the cached choices and table explicitly
+    _voice_choices_cache = None
+    _voice_table_cache = None
     choices = _load_voice_choices()
     new_value = voice_name if voice_name in choices else (choices[0] if choices else None)
     status_prefix = "✅" if success else "❌"
     
-    # Update metadata
     metadata = get_voice_metadata_table()
     
     return f"{status_prefix} {msg}", gr.update(choices=choices, value=new_value), choices, metadata
 
 
+# (voices dir mtime_ns, rows) from the last get_voice_metadata_table call
+_voice_table_cache = None
+
+
 def get_voice_metadata_table():
-    """Get voice metadata as table."""
+    """Get voice metadata as table, rebuilt only when the voices directory changes."""
+    global _voice_table_cache
     voices_dir = engine.voices_dir
+    try:
+        mtime_ns = os.stat(voices_dir).st_mtime_ns
+    except OSError:
+        mtime_ns = None
+    if mtime_ns is not None and _voice_table_cache is not None and _voice_table_cache[0] == mtime_ns:
+        return list(_voice_table_cache[1])
+    
     metadata = []
     
     for voice_file in sorted(voices_dir.glob("*.wav")):
@@ -299,7 +340,9 @@ def get_voice_metadata_table():
             "Added": meta["date_added"]
         })
     
-    return metadata
+    if mtime_ns is not None:
+        _voice_table_cache = (mtime_ns, metadata)
+    return list(metadata)
 
 
 def refresh_voices_handler():
@@ -753,14 +796,31 @@ with gr.Blocks(css=STARSILK_CSS, title="DexTalker") as demo:
     btn_regen_token.click(regenerate_access_token_handler, outputs=[net_token_status])
     btn_refresh_status.click(get_network_status, outputs=[net_connection_status])
 
-if __name__ == "__main__":
+def main():
+    """Serve the UI with the saved network settings, then load the model."""
     # Get network configuration
     config = network_auth.get_config()
     bind_addr = config["bind_address"]
     port = config["port"]
     
+    # Warm the video-clone imports while the server starts
+    from app.video import preload_dependencies
+    preload_dependencies()
+    
     logger.info(f"Launching DexTalker on {bind_addr}:{port}")
-    demo.launch(server_name=bind_addr, server_port=port)
+    demo.launch(server_name=bind_addr, server_port=port, prevent_thread_lock=True)
+    # The listener is bound; wake the launcher that started us, if any
+    signal_ready()
+    
+    # Load the model while the server is already answering. The first load
+    # may download weights, so it must not count against the launchers'
+    # startup timeout; requests that arrive meanwhile wait on the same load.
+    asyncio.run(engine.initialize())
+    demo.block_thread()
+
+
+if __name__ == "__main__":
+    main()
 
 # Network Settings Handlers
 
@@ -812,8 +872,10 @@ def copy_url_handler(url):
 
 def get_network_status():
     """Get network connectivity status."""
-    from app.network.utils import get_tailscale_status, check_port_available
+    from app.network.utils import get_tailscale_status, check_port_available, invalidate_network_cache
     
+    # An explicit status check should see the network as it is now
+    invalidate_network_cache()
     config = network_auth.get_config()
     port = config["port"]
     
@@ -1,18 +1,60 @@
 """
 Utility functions for DexTalker UI and text processing.
 """
+import logging
 import re
+import time
+from logging.handlers import RotatingFileHandler
 from pathlib import Path
 from typing import Tuple
 
+# Patterns used by preprocess_text. The URL patterns run to the next
+# whitespace, which keeps matching linear in the input length.
+_URL_RE = re.compile(r'https?://\S+')
+_WWW_RE = re.compile(r'www\.\S+')
+_SPECIAL_RE = re.compile(r'[^a-zA-Z0-9\s.,!?;:\'\"-]')
+_WS_RE = re.compile(r'\s+')
+# ASCII half of _SPECIAL_RE as a str.translate table (deletes what the regex removes)
+_SPECIAL_TABLE = {
+    i: None for i in range(128)
+    if not (chr(i).isalnum() or chr(i).isspace() or chr(i) in ".,!?;:'\"-")
+}
+
+
+def configure_logging(log_file: str = "dextalker.log", level: int = logging.INFO) -> None:
+    """
+    Configure root logging for the app: console plus a rotating log file.
+    
+    File records are written as they are emitted: the launchers stop the
+    server with SIGTERM/SIGKILL, which would drop anything still buffered.
+    Calling this more than once is a no-op.
+    """
+    root = logging.getLogger()
+    if root.handlers:
+        return
+
+    formatter = logging.Formatter('%(asctime)s | %(name)s | %(levelname)s | %(message)s')
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(formatter)
+    # delay=True: the file is not opened until the first record.
+    file_handler = RotatingFileHandler(log_file, maxBytes=5_000_000, backupCount=3, delay=True)
+    file_handler.setFormatter(formatter)
+
+    root.setLevel(level)
+    root.addHandler(stream_handler)
+    root.addHandler(file_handler)
+
+
+_SIZE_UNITS = ("B", "KB", "MB", "GB", "TB")
+
 
 def format_file_size(size_bytes: int) -> str:
     """Format file size in human-readable format."""
-    for unit in ['B', 'KB', 'MB', 'GB']:
-        if size_bytes < 1024.0:
-            return f"{size_bytes:.1f} {unit}"
-        size_bytes /= 1024.0
-    return f"{size_bytes:.1f} TB"
+    if size_bytes < 1024:
+        return f"{size_bytes:.1f} B"
+    # Unit index is the power of 1024, read exactly from the bit length
+    idx = min((int(size_bytes).bit_length() - 1) // 10, len(_SIZE_UNITS) - 1)
+    return f"{size_bytes / (1 << (10 * idx)):.1f} {_SIZE_UNITS[idx]}"
 
 
 def get_text_stats(text: str) -> Tuple[int, int, float]:
@@ -59,15 +101,17 @@ def preprocess_text(text: str, remove_urls: bool = False, remove_special: bool =
     
     if remove_urls:
         # Remove URLs
-        result = re.sub(r'http[s]?://(?:[a-zA-Z]|[0-9]|[$-_@.&+]|[!*\\(\\),]|(?:%[0-9a-fA-F][0-9a-fA-F]))+', '', result)
-        result = re.sub(r'www\.(?:[a-zA-Z]|[0-9]|[$-_@.&+]|[!*\\(\\),]|(?:%[0-9a-fA-F][0-9a-fA-F]))+', '', result)
+        result = _URL_RE.sub('', result)
+        result = _WWW_RE.sub('', result)
     
     if remove_special:
         # Keep letters, numbers, spaces, and basic punctuation
-        result = re.sub(r'[^a-zA-Z0-9\s.,!?;:\'\"-]', '', result)
+        result = result.translate(_SPECIAL_TABLE)
+        if not result.isascii():
+            result = _SPECIAL_RE.sub('', result)
     
     # Normalize whitespace
-    result = re.sub(r'\s+', ' ', result)
+    result = _WS_RE.sub(' ', result)
     result = result.strip()
     
     return result
@@ -80,24 +124,25 @@ def get_voice_metadata(voice_path: Path) -> dict:
     Returns:
         dict with keys: duration, size, date_added
     """
-    if not voice_path.exists():
+    try:
+        st = voice_path.stat()
+    except FileNotFoundError:
         return {"duration": "N/A", "size": "N/A", "date_added": "N/A"}
     
-    size = voice_path.stat().st_size
-    date_added = voice_path.stat().st_mtime
+    size = st.st_size
+    date_added = st.st_mtime
     
     # Try to get audio duration
     duration_str = "N/A"
     try:
         import soundfile as sf
-        data, sr = sf.read(str(voice_path))
-        duration = len(data) / sr
-        duration_str = format_duration(duration)
+        # Header only; no need to decode the samples for a length
+        info = sf.info(str(voice_path))
+        duration_str = format_duration(info.frames / info.samplerate)
     except Exception:
         pass
     
-    from datetime import datetime
-    date_str = datetime.fromtimestamp(date_added).strftime("%Y-%m-%d")
+    date_str = time.strftime("%Y-%m-%d", time.localtime(date_added))
     
     return {
         "duration": duration_str,
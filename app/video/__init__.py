@@ -1,4 +1,4 @@
 """Video processing package for DexTalker."""
-from .processor import VideoProcessor
+from .processor import VideoProcessor, preload_dependencies
 
-__all__ = ['VideoProcessor']
+__all__ = ['VideoProcessor', 'preload_dependencies']
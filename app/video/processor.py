@@ -2,17 +2,137 @@
 Video processing module for DexTalker Video Voice Clone feature.
 Handles video upload, validation, trimming, and audio extraction.
 """
+import importlib
 import logging
+import math
+import threading
+import wave
 from pathlib import Path
 from typing import Tuple, Optional, Dict
 import json
 
 logger = logging.getLogger("DexTalker.Video")
 
+# Frame length (samples) for the per-frame RMS silence check
+_RMS_FRAME = 2048
+
+
+def preload_dependencies() -> threading.Thread:
+    """
+    Import the video pipeline's dependencies in a background thread.
+    
+    They are imported lazily inside the methods; warming them at startup
+    moves that cost off the first video-clone request. Missing optional
+    packages are ignored here and reported when actually used.
+    
+    Returns:
+        The started daemon thread
+    """
+    def _warm():
+        for name in ("ffmpeg", "soundfile", "pymediainfo"):
+            try:
+                importlib.import_module(name)
+            except Exception:
+                pass
+    
+    thread = threading.Thread(target=_warm, name="DexTalkerVideoPreload", daemon=True)
+    thread.start()
+    return thread
+
+
+# Probe results keyed by (path, mtime_ns, size), shared by every
+# VideoProcessor: the engine builds a new processor per request, and an
+# upload is validated and then inspected, so this saves the second probe.
+_PROBE_CACHE_SIZE = 32
+_probe_cache: Dict[tuple, Dict] = {}
+_probe_lock = threading.Lock()
+
+
+# MediaInfo format names -> the names ffprobe reports, so get_video_info()
+# returns the same values whichever backend read the file.
+_MEDIAINFO_CONTAINERS = {
+    'MPEG-4': 'mov,mp4,m4a,3gp,3g2,mj2',
+    'QuickTime': 'mov,mp4,m4a,3gp,3g2,mj2',
+    'Matroska': 'matroska,webm',
+    'WebM': 'matroska,webm',
+    'AVI': 'avi',
+    'Flash Video': 'flv',
+    'MPEG-TS': 'mpegts',
+}
+_MEDIAINFO_CODECS = {
+    'AVC': 'h264',
+    'HEVC': 'hevc',
+    'VP8': 'vp8',
+    'VP9': 'vp9',
+    'AV1': 'av1',
+    'MPEG-4 Visual': 'mpeg4',
+    'ProRes': 'prores',
+    'AAC': 'aac',
+    'Opus': 'opus',
+    'Vorbis': 'vorbis',
+    'FLAC': 'flac',
+    'AC-3': 'ac3',
+    'E-AC-3': 'eac3',
+    'ALAC': 'alac',
+}
+
+
+def _mediainfo_probe(path: str) -> Optional[Dict]:
+    """
+    Read metadata with libmediainfo, shaped and named like the ffprobe fields we use.
+    
+    Returns None if pymediainfo/libmediainfo is unavailable, the file has no
+    duration, or a container/codec has no known ffprobe name, so the caller
+    can fall back to ffprobe.
+    """
+    try:
+        from pymediainfo import MediaInfo
+        media = MediaInfo.parse(path)
+    except Exception:
+        return None
+    
+    general = media.general_tracks[0] if media.general_tracks else None
+    if general is None or general.duration is None:
+        return None
+    format_name = _MEDIAINFO_CONTAINERS.get(general.format)
+    if format_name is None:
+        return None
+    
+    streams = []
+    for track in media.video_tracks:
+        codec = _MEDIAINFO_CODECS.get(track.format)
+        if codec is None:
+            return None
+        streams.append({
+            'codec_type': 'video',
+            'codec_name': codec,
+            'width': track.width,
+            'height': track.height,
+        })
+    for track in media.audio_tracks:
+        codec = _MEDIAINFO_CODECS.get(track.format)
+        if codec is None:
+            return None
+        streams.append({
+            'codec_type': 'audio',
+            'codec_name': codec,
+            'sample_rate': str(track.sampling_rate) if track.sampling_rate else None,
+        })
+    
+    return {
+        'format': {
+            # MediaInfo reports milliseconds
+            'duration': float(general.duration) / 1000.0,
+            'format_name': format_name,
+        },
+        'streams': streams,
+    }
+
+
 class VideoProcessor:
     """
     Processes videos for voice cloning: validation, trimming, and audio extraction.
-    Uses ffmpeg for video/audio operations and librosa for audio analysis.
+    Uses ffmpeg for video/audio operations and soundfile for audio analysis.
     """
     
     def __init__(self, config: Optional[Dict] = None):
@@ -32,6 +152,36 @@ class VideoProcessor:
         logger.info(f"VideoProcessor initialized: max_size={self.max_size_mb}MB, "
                    f"max_duration={self.max_duration}s, target_sr={self.target_sr}Hz")
     
+    def _probe(self, file_path: Path, st=None) -> Dict:
+        """
+        Read container metadata, reusing the result while the file is unchanged.
+        
+        Uses pymediainfo (in-process) when available, otherwise ffprobe.
+        
+        Args:
+            file_path: Path to media file
+            st: Optional os.stat_result for file_path, to avoid a second stat
+            
+        Returns:
+            Metadata in ffprobe's shape ({'format': ..., 'streams': [...]})
+        """
+        if st is None:
+            st = file_path.stat()
+        key = (str(file_path), st.st_mtime_ns, st.st_size)
+        with _probe_lock:
+            probe = _probe_cache.get(key)
+        if probe is None:
+            probe = _mediainfo_probe(key[0])
+            if probe is None:
+                import ffmpeg
+                probe = ffmpeg.probe(key[0])
+            with _probe_lock:
+                if len(_probe_cache) >= _PROBE_CACHE_SIZE:
+                    # Drop the oldest entry; dicts keep insertion order
+                    del _probe_cache[next(iter(_probe_cache))]
+                _probe_cache[key] = probe
+        return probe
+    
     def validate_video(self, file_path: Path) -> Tuple[bool, str]:
         """
         Validate video file size and duration.
@@ -44,18 +194,19 @@ class VideoProcessor:
         """
         try:
             # Check file exists
-            if not file_path.exists():
+            try:
+                st = file_path.stat()
+            except FileNotFoundError:
                 return False, "File not found"
             
             # Check file size
-            size_mb = file_path.stat().st_size / (1024 * 1024)
+            size_mb = st.st_size / (1024 * 1024)
             if size_mb > self.max_size_mb:
                 return False, f"File size ({size_mb:.1f}MB) exceeds {self.max_size_mb}MB limit"
             
             # Check duration using ffprobe
             try:
-                import ffmpeg
-                probe = ffmpeg.probe(str(file_path))
+                probe = self._probe(file_path, st)
                 duration = float(probe['format']['duration'])
                 
                 if duration > self.max_duration:
@@ -83,15 +234,15 @@ class VideoProcessor:
             Dict with video info or None if failed
         """
         try:
-            import ffmpeg
-            probe = ffmpeg.probe(str(file_path))
+            st = file_path.stat()
+            probe = self._probe(file_path, st)
             
             video_streams = [s for s in probe['streams'] if s['codec_type'] == 'video']
             audio_streams = [s for s in probe['streams'] if s['codec_type'] == 'audio']
             
             info = {
                 'duration': float(probe['format']['duration']),
-                'size_mb': file_path.stat().st_size / (1024 * 1024),
+                'size_mb': st.st_size / (1024 * 1024),
                 'format': probe['format']['format_name'],
                 'has_video': len(video_streams) > 0,
                 'has_audio': len(audio_streams) > 0,
@@ -139,6 +290,7 @@ class VideoProcessor:
         """
         try:
             import ffmpeg
+            import numpy as np
             
             # Validate trim range
             duration = end_sec - start_sec
@@ -153,14 +305,16 @@ class VideoProcessor:
             # Create parent directory if needed
             output_path.parent.mkdir(parents=True, exist_ok=True)
             
-            # Extract audio using ffmpeg
+            # Decode straight to raw PCM on stdout and check it in memory;
+            # the WAV is only written once the audio passes validation
             # -ss: start time, -t: duration
-            # -acodec pcm_s16le: 16-bit PCM WAV
+            # s16le/pcm_s16le: raw 16-bit little-endian PCM
             # -ar: sample rate, -ac 1: mono
             stream = ffmpeg.input(str(video_path), ss=start_sec, t=duration)
             stream = ffmpeg.output(
                 stream,
-                str(output_path),
+                'pipe:',
+                format='s16le',
                 acodec='pcm_s16le',
                 ar=self.target_sr,
                 ac=1,  # mono
@@ -168,30 +322,33 @@ class VideoProcessor:
             )
             
             # Run extraction
-            ffmpeg.run(stream, overwrite_output=True, capture_stdout=True, capture_stderr=True)
+            pcm, _ = ffmpeg.run(stream, capture_stdout=True, capture_stderr=True)
             
             # Validate extracted audio
-            if not output_path.exists() or output_path.stat().st_size == 0:
+            if not pcm:
                 return False, "Audio extraction produced empty file"
             
-            valid, msg = self.validate_audio_quality(output_path)
+            samples = np.frombuffer(pcm, dtype='<i2', count=len(pcm) // 2)
+            valid, msg = self._check_pcm_quality((samples,), self.target_sr, len(samples))
             if not valid:
-                # Clean up bad output
-                if output_path.exists():
-                    output_path.unlink()
                 return False, msg
             
+            with wave.open(str(output_path), 'wb') as wav:
+                wav.setnchannels(1)
+                wav.setsampwidth(2)
+                wav.setframerate(self.target_sr)
+                wav.writeframes(pcm[:len(samples) * 2])
+            
             logger.info(f"Audio extracted successfully: {output_path}")
             return True, f"Audio extracted: {duration:.1f}s at {self.target_sr}Hz"
             
         except Exception as e:
             logger.error(f"Audio extraction failed: {e}")
             # Clean up on error
-            if output_path.exists():
-                try:
-                    output_path.unlink()
-                except:
-                    pass
+            try:
+                output_path.unlink(missing_ok=True)
+            except OSError:
+                pass
             
             error_msg = str(e)
             if "ffmpeg" in error_msg.lower():
@@ -209,37 +366,75 @@ class VideoProcessor:
             Tuple of (is_valid, message)
         """
         try:
-            import librosa
-            import numpy as np
+            import soundfile as sf
             
-            # Load audio
-            y, sr = librosa.load(str(audio_path), sr=None)
-            duration = len(y) / sr
-            
-            logger.info(f"Audio analysis: duration={duration:.2f}s, sr={sr}Hz")
-            
-            # Check minimum duration
-            if duration < self.min_audio_duration:
-                return False, f"Audio too short ({duration:.1f}s). Minimum {self.min_audio_duration}s required"
-            
-            # Check for silence (RMS energy analysis)
-            rms = librosa.feature.rms(y=y)[0]
-            mean_rms = np.mean(rms)
-            
-            if mean_rms < 0.005:  # Very quiet threshold
-                return False, "Audio appears to be silent or very quiet. Please select a segment with clear speech."
-            
-            # Check for clipping
-            if np.max(np.abs(y)) > 0.99:
-                logger.warning("Audio may be clipping (very loud)")
-            
-            logger.info(f"Audio quality OK: RMS={mean_rms:.4f}")
-            return True, f"Audio quality good ({duration:.1f}s, RMS={mean_rms:.4f})"
+            info = sf.info(str(audio_path))
+            blocks = sf.blocks(str(audio_path), blocksize=_RMS_FRAME * 64, dtype='int16')
+            return self._check_pcm_quality(blocks, info.samplerate, info.frames)
             
         except Exception as e:
             logger.error(f"Audio quality check failed: {e}")
             return False, f"Failed to analyze audio: {str(e)}"
     
+    def _check_pcm_quality(self, blocks, sr: int, n_samples: int) -> Tuple[bool, str]:
+        """
+        Duration, silence and clipping checks over 16-bit PCM sample blocks.
+        
+        Args:
+            blocks: Iterable of int16 arrays (1-D mono, or 2-D frames x channels)
+            sr: Sample rate
+            n_samples: Total samples per channel
+            
+        Returns:
+            Tuple of (is_valid, message)
+        """
+        import numpy as np
+        
+        duration = n_samples / sr
+        
+        logger.info(f"Audio analysis: duration={duration:.2f}s, sr={sr}Hz")
+        
+        # Check minimum duration
+        if duration < self.min_audio_duration:
+            return False, f"Audio too short ({duration:.1f}s). Minimum {self.min_audio_duration}s required"
+        
+        # Check for silence (mean of per-frame RMS energy), one block at a
+        # time. Samples stay integer and are squared in int64 with no float
+        # conversion; 32768 is full scale.
+        frame = _RMS_FRAME
+        rms_sum = 0.0
+        n_frames = 0
+        peak = 0
+        for block in blocks:
+            if block.ndim > 1:
+                block = block.astype(np.int32).sum(axis=1) // block.shape[1]
+            if not len(block):
+                continue
+            block = block.astype(np.int64)
+            peak = max(peak, int(block.max()), -int(block.min()))
+            n_full = len(block) // frame
+            if n_full:
+                frames = block[:n_full * frame].reshape(n_full, frame)
+                sq = np.einsum('ij,ij->i', frames, frames)
+                rms_sum += float(np.sqrt(sq / frame).sum())
+                n_frames += n_full
+            tail = block[n_full * frame:]
+            if len(tail):
+                rms_sum += math.sqrt(int(np.dot(tail, tail)) / len(tail))
+                n_frames += 1
+        mean_rms = rms_sum / n_frames / 32768.0 if n_frames else 0.0
+        peak = peak / 32768.0
+        
+        if mean_rms < 0.005:  # Very quiet threshold
+            return False, "Audio appears to be silent or very quiet. Please select a segment with clear speech."
+        
+        # Check for clipping
+        if peak > 0.99:
+            logger.warning("Audio may be clipping (very loud)")
+        
+        logger.info(f"Audio quality OK: RMS={mean_rms:.4f}")
+        return True, f"Audio quality good ({duration:.1f}s, RMS={mean_rms:.4f})"
+    
     def cleanup_temp_files(self, *file_paths: Path):
         """
         Clean up temporary files.
@@ -248,9 +443,14 @@ class VideoProcessor:
             file_paths: Paths to files to delete
         """
         for path in file_paths:
-            if path and path.exists():
-                try:
-                    path.unlink()
-                    logger.info(f"Cleaned up: {path}")
-                except Exception as e:
-                    logger.warning(f"Failed to clean up {path}: {e}")
+            if not path:
+                continue
+            # unlink directly rather than exists() first: one syscall, no race
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                continue
+            except OSError as e:
+                logger.warning(f"Failed to clean up {path}: {e}")
+                continue
+            logger.info(f"Cleaned up: {path}")
@@ -9,10 +9,9 @@ def main():
     os.chdir(base_dir)
     sys.path.insert(0, str(base_dir))
     
-    # Execute main.py which contains the proper launch configuration
-    # This ensures network settings are respected
-    import runpy
-    runpy.run_module("app.ui.main", run_name="__main__")
+    # app.ui.main.main() launches with the saved network settings
+    from app.ui.main import main as run_ui
+    run_ui()
 
 if __name__ == "__main__":
     main()
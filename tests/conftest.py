@@ -0,0 +1,25 @@
+"""
+Shared pytest fixtures.
+"""
+import asyncio
+
+import pytest
+
+from app.engine.chatterbox import ChatterboxEngine
+
+
+@pytest.fixture(scope="session")
+def session_loop():
+    """One event loop for the session, so session-scoped async state stays usable."""
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+
+@pytest.fixture(scope="session")
+def initialized_engine(session_loop, tmp_path_factory):
+    """A ChatterboxEngine initialized once and shared by every test in the session."""
+    engine = ChatterboxEngine(data_dir=str(tmp_path_factory.mktemp("engine")))
+    success, msg = session_loop.run_until_complete(engine.initialize())
+    assert success, msg
+    return engine
@@ -0,0 +1,96 @@
+"""
+Integration tests for ChatterboxEngine, run against one shared initialized engine.
+"""
+import asyncio
+import os
+import threading
+
+import pytest
+
+from app.engine.chatterbox import ChatterboxEngine, _env_int
+
+
+@pytest.mark.parametrize("raw,expected", [
+    (None, 16),
+    ("4", 4),
+    ("abc", 16),
+    ("0", 1),
+])
+def test_env_int(monkeypatch, raw, expected):
+    """Test tuning knobs fall back on malformed values and clamp to the minimum."""
+    if raw is None:
+        monkeypatch.delenv("DEXTALKER_TEST_KNOB", raising=False)
+    else:
+        monkeypatch.setenv("DEXTALKER_TEST_KNOB", raw)
+    assert _env_int("DEXTALKER_TEST_KNOB", 16, minimum=1) == expected
+
+
+@pytest.fixture
+def dummy_wav(tmp_path):
+    """A placeholder .wav file for the save/add-voice paths, which only copy bytes."""
+    path = tmp_path / "test_rec.wav"
+    path.write_text("dummy audio content")
+    return path
+
+
+class TestChatterboxEngine:
+    """Test engine operations end to end (fallback mode when no model is installed)."""
+    
+    def test_initialize(self, initialized_engine, session_loop):
+        """Test initialize is idempotent once the engine is loaded."""
+        assert initialized_engine.is_loaded
+        success, _ = session_loop.run_until_complete(initialized_engine.initialize())
+        assert success
+    
+    def test_initialize_shared_across_loops(self, tmp_path, monkeypatch):
+        """Test concurrent initialize calls from separate event loops share one load."""
+        engine = ChatterboxEngine(data_dir=str(tmp_path / "data"))
+        loads = []
+        original_load = engine._load
+        
+        async def counting_load():
+            loads.append(1)
+            await asyncio.sleep(0.05)
+            return await original_load()
+        
+        monkeypatch.setattr(engine, "_load", counting_load)
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(asyncio.run(engine.initialize())))
+            for _ in range(2)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        assert len(loads) == 1
+        assert [ok for ok, _ in results] == [True, True]
+        assert engine.is_loaded
+    
+    def test_synthesize(self, initialized_engine, session_loop):
+        """Test synthesis writes an output file."""
+        path, status = session_loop.run_until_complete(
+            initialized_engine.synthesize("Hello Verification", "default")
+        )
+        assert path, status
+        assert os.path.exists(path)
+    
+    def test_save_recording(self, initialized_engine, session_loop, dummy_wav):
+        """Test saving a recording and listing it back."""
+        saved_path, status = session_loop.run_until_complete(
+            initialized_engine.save_recording(dummy_wav, "test_rec")
+        )
+        assert saved_path, status
+        assert os.path.exists(saved_path)
+        
+        recs = initialized_engine.get_saved_recordings()
+        assert saved_path in [path for _, path in recs]
+    
+    def test_add_voice(self, initialized_engine, session_loop, dummy_wav):
+        """Test adding a voice sanitizes its name and lists it."""
+        ok, msg = session_loop.run_until_complete(
+            initialized_engine.add_voice("New Voice", dummy_wav)
+        )
+        assert ok, msg
+        assert "New_Voice" in initialized_engine.get_available_voices()
@@ -1,14 +1,16 @@
 """
 Unit tests for Video Processor
 """
+import sys
+import types
 import pytest
 from pathlib import Path
-from app.video.processor import VideoProcessor
+from app.video.processor import VideoProcessor, _mediainfo_probe
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def video_processor():
-    """Create a VideoProcessor instance with test config."""
+    """Create a VideoProcessor instance with test config (read-only, shared by the module)."""
     config = {
         "max_upload_size_mb": 100,
         "max_video_duration_sec": 300,
@@ -60,3 +62,50 @@ def test_audio_quality_validation_logic(video_processor):
     
     # Verify minimum duration requirement
     assert video_processor.min_audio_duration > 0
+
+
+def _fake_mediainfo(monkeypatch, container, video_codec, audio_codec):
+    """Install a stand-in pymediainfo that reports the given format names."""
+    track = types.SimpleNamespace
+    media = track(
+        general_tracks=[track(duration=12500, format=container)],
+        video_tracks=[track(format=video_codec, width=1920, height=1080)],
+        audio_tracks=[track(format=audio_codec, sampling_rate=48000)],
+    )
+    module = types.ModuleType("pymediainfo")
+    module.MediaInfo = types.SimpleNamespace(parse=lambda path: media)
+    monkeypatch.setitem(sys.modules, "pymediainfo", module)
+
+
+def test_mediainfo_probe_uses_ffprobe_names(monkeypatch):
+    """Test MediaInfo format names are reported as ffprobe would name them."""
+    _fake_mediainfo(monkeypatch, "MPEG-4", "AVC", "AAC")
+    probe = _mediainfo_probe("clip.mp4")
+    
+    assert probe['format'] == {'duration': 12.5, 'format_name': 'mov,mp4,m4a,3gp,3g2,mj2'}
+    assert [s['codec_name'] for s in probe['streams']] == ['h264', 'aac']
+    assert probe['streams'][1]['sample_rate'] == '48000'
+
+
+def test_mediainfo_probe_unknown_codec_falls_back(monkeypatch):
+    """Test an unmapped codec name defers to ffprobe."""
+    _fake_mediainfo(monkeypatch, "MPEG-4", "AVC", "Some Future Codec")
+    assert _mediainfo_probe("clip.mp4") is None
+
+
+def test_probe_shared_across_processors(monkeypatch, tmp_path):
+    """Test a probe result is reused by a new VideoProcessor for the same unchanged file."""
+    _fake_mediainfo(monkeypatch, "MPEG-4", "AVC", "AAC")
+    media_info = sys.modules["pymediainfo"].MediaInfo
+    calls = []
+    parse = media_info.parse
+    media_info.parse = lambda path: calls.append(path) or parse(path)
+    clip = tmp_path / "clip.mp4"
+    clip.write_bytes(b"not really a video")
+    
+    valid, _ = VideoProcessor().validate_video(clip)
+    info = VideoProcessor().get_video_info(clip)
+    
+    assert valid
+    assert info['video_codec'] == 'h264'
+    assert calls == [str(clip)]